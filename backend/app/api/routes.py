@@ -1,13 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from app.domain.models import DocumentationRequest, DocumentationResponse
 from app.services.documentation_service import DocumentationService
 from app.core.config import settings
 
 router = APIRouter()
-documentation_service = DocumentationService()
+
+def get_documentation_service(request: Request) -> DocumentationService:
+    """
+    Devuelve el servicio del estado de la aplicación. Se crea en el lifespan,
+    o en la primera petición si la aplicación se montó sin él.
+    """
+    service = getattr(request.app.state, "documentation_service", None)
+    if service is None:
+        service = request.app.state.documentation_service = DocumentationService()
+    return service
 
 @router.post("/generate", response_model=DocumentationResponse)
-async def generate_documentation(request: DocumentationRequest):
+async def generate_documentation(
+    request: DocumentationRequest,
+    documentation_service: DocumentationService = Depends(get_documentation_service)
+):
     try:
         return await documentation_service.generate_documentation(request)
     except Exception as e:
@@ -23,4 +35,4 @@ async def check_config():
         "openai_api_key": "present" if settings.OPENAI_API_KEY else "missing",
         "github_token": "present" if settings.GITHUB_TOKEN else "missing",
         "env_file": settings.Config.env_file
-    } 
\ No newline at end of file
+    }
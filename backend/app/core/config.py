@@ -1,7 +1,6 @@
-import os
-from pathlib import Path
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, List
 
 class Settings(BaseSettings):
     # API
@@ -12,7 +11,15 @@ class Settings(BaseSettings):
     
     # OpenAI
     OPENAI_API_KEY: str
-    OPENAI_MODEL: str = "gpt-4"
+    OPENAI_MODEL: str = "gpt-4"  # Modelo por defecto si no se configuran niveles
+    OPENAI_MODEL_TIERS: List[str] = ["gpt-4o-mini", "gpt-4o", "gpt-4-turbo"]  # Del más barato al más capaz
+    MODEL_ROUTING_TOKEN_THRESHOLDS: List[int] = [6000, 24000]  # Tokens del prompt para subir de nivel
+    MODEL_ROUTING_COMPLEXITY_THRESHOLDS: List[float] = [5.0, 9.0]  # Complejidad para subir de nivel
+    MODEL_ROUTING_SECTION_MIN_TIER: Dict[str, int] = {}  # Nivel mínimo por sección
+    ARCHITECTURE_AI_ANNOTATIONS: bool = False  # Anotar con IA el diagrama generado localmente
+    AI_MAX_CONCURRENCY: int = 4  # Llamadas simultáneas a la IA
+    COMMENTS_BATCH_TOKENS: int = 3000  # Tamaño aproximado de cada lote de símbolos
+    DOCSTRING_CACHE_SIZE: int = 10000  # Docstrings cacheados por hash del código
     
     # GitHub
     GITHUB_TOKEN: str
@@ -20,15 +27,34 @@ class Settings(BaseSettings):
     
     # Environment
     ENVIRONMENT: str = "development"
+    WARMUP_ON_STARTUP: bool = False  # Abrir conexiones y el almacén de resultados antes de aceptar peticiones
     
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     
     # Cache
     CACHE_TTL: int = 3600  # 1 hora
+
+    # Result Store
+    RESULT_STORE_BACKEND: str = "sqlite"  # sqlite, none o "modulo:Clase"
+    RESULT_STORE_PATH: str = "docgen_results.sqlite3"
+    RESULT_STORE_MAX_BYTES: int = 512 * 1024 * 1024  # 512MB comprimidos
+    RESULT_STORE_MAX_AGE: int = 30 * 24 * 3600  # 30 días
     
     # File Analysis
     MAX_FILE_SIZE: int = 1024 * 1024  # 1MB
+    BINARY_SNIFF_BYTES: int = 8192  # Bytes inspeccionados para detectar binarios
+    PIPELINE_QUEUE_SIZE: int = 16  # Capacidad de las colas entre etapas
+    PIPELINE_FETCH_CONCURRENCY: int = 8  # Descargas simultáneas
+    MANIFEST_MAX_SIZE: int = 16 * 1024 * 1024  # Los lockfiles pueden superar MAX_FILE_SIZE
+    # Reglas con sintaxis de .gitignore; los directorios excluidos no se listan ni descargan
+    PATH_EXCLUDE: List[str] = [
+        "node_modules/", "bower_components/", "vendor/", "third_party/",
+        "dist/", "build/", "target/", "out/", ".next/", "coverage/",
+        ".venv/", "venv/", "__pycache__/", ".tox/", ".mypy_cache/", ".pytest_cache/",
+        ".git/", ".idea/", ".vscode/", "*.min.js", "*.min.css", "*.map"
+    ]
+    PATH_INCLUDE: List[str] = []  # Si no está vacío, solo se parsean los archivos que coinciden (rutas desde la raíz)
     SUPPORTED_LANGUAGES: set = {
         "python", "javascript", "typescript", "java", "go",
         "ruby", "php", "csharp", "cpp", "rust"
@@ -43,21 +69,6 @@ def get_settings() -> Settings:
     """
     Retorna una instancia cacheada de la configuración.
     """
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    logger.debug(f"Buscando archivo .env en: {env_path}")
-    logger.debug(f"Archivo .env existe: {env_path.exists()}")
-    
-    if env_path.exists():
-        logger.debug("Contenido del archivo .env:")
-        with open(env_path, 'r') as f:
-            for line in f:
-                if '=' in line:
-                    key = line.split('=')[0]
-                    logger.debug(f"Variable encontrada: {key}")
-    
-    settings = Settings()
-    logger.debug(f"GitHub Token configurado: {'Sí' if settings.GITHUB_TOKEN else 'No'}")
-    logger.debug(f"Longitud del GitHub Token: {len(settings.GITHUB_TOKEN) if settings.GITHUB_TOKEN else 0}")
-    return settings
+    return Settings()
 
-settings = get_settings() 
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, PrivateAttr
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -18,12 +18,15 @@ class DocumentationRequest(BaseModel):
     generate_comments: bool = True
     generate_architecture: bool = True
     generate_checklist: bool = True
+    include_paths: Optional[List[str]] = None  # Rutas relativas a la raíz (comodines de .gitignore) a parsear
+    exclude_paths: Optional[List[str]] = None  # Reglas estilo .gitignore de rutas a excluir
 
 class DocumentationResponse(BaseModel):
     readme: Optional[str] = None
     comments: Optional[List[dict]] = None
     architecture: Optional[str] = None
     checklist: Optional[List[str]] = None
+    metadata: Optional[Dict[str, Any]] = None  # Modelo y latencia por sección
 
 # Nuevos modelos para el análisis de repositorios
 class FileInfo(BaseModel):
@@ -43,9 +46,22 @@ class RepositoryStructure(BaseModel):
     config_files: List[FileInfo]  # Archivos de configuración
 
 class RepositoryAnalysis(BaseModel):
-    structure: RepositoryStructure
     languages: Dict[str, int]  # Lenguajes y cantidad de archivos
     dependencies: Dict[str, List[str]]  # Dependencias por tipo (pip, npm, etc.)
+    dependency_graph: Dict[str, Dict[str, List[str]]] = {}  # Ecosistema → paquete → dependencias
+    transitive_dependencies: Dict[str, List[str]] = {}  # Paquetes fijados en lockfiles no declarados
     main_tech_stack: List[str]  # Tecnologías principales detectadas
     project_type: Optional[str] = None  # Web, CLI, Library, etc.
-    complexity_score: Optional[float] = None  # Score de complejidad del proyecto 
\ No newline at end of file
+    complexity_score: Optional[float] = None  # Score de complejidad del proyecto 
+    statistics: Dict[str, Any] = {}  # Estadísticas calculadas sobre el índice de archivos
+
+    # Índice columnar de archivos; no se serializa
+    _index: Any = PrivateAttr(default=None)
+
+    @property
+    def index(self) -> Any:
+        return self._index
+
+    @index.setter
+    def index(self, value: Any) -> None:
+        self._index = value
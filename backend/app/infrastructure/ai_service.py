@@ -1,37 +1,145 @@
 import os
-from typing import Dict, Any
-from openai import AsyncOpenAI
-from app.domain.models import DocumentationRequest
+import re
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Callable
+from app.domain.models import DocumentationRequest, RepositoryAnalysis
 from app.core.config import settings
+from app.core.exceptions import AIServiceError
+from app.infrastructure.import_graph import ImportGraph
+from app.infrastructure.model_router import ModelRouter
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 class AIService:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.router = ModelRouter()
+        self._client: Optional["AsyncOpenAI"] = None
+        self._docstring_cache: "OrderedDict[str, str]" = OrderedDict()
 
-    async def generate_documentation(self, parsed_code: Dict[str, Any], request: DocumentationRequest) -> Dict[str, Any]:
+    @property
+    def client(self) -> "AsyncOpenAI":
         """
-        Genera documentación usando IA basada en el código parseado.
+        Cliente de OpenAI creado en el primer uso: importar el SDK es costoso
+        y no debe ocurrir al importar el módulo.
         """
-        documentation = {}
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        return self._client
 
-        if request.generate_readme:
-            documentation["readme"] = await self._generate_readme(parsed_code)
+    async def warmup(self) -> None:
+        """
+        Importa el SDK y abre el pool de conexiones con la API de OpenAI.
+        """
+        try:
+            await self.client.models.list()
+        except Exception as e:
+            print(f"Error warming up OpenAI client: {e}")
 
-        if request.generate_comments:
-            documentation["comments"] = await self._generate_comments(parsed_code)
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
 
-        if request.generate_architecture:
-            documentation["architecture"] = await self._generate_architecture(parsed_code)
+    async def generate_documentation(
+        self,
+        parsed_code: Dict[str, Any],
+        request: DocumentationRequest,
+        analysis: Optional[RepositoryAnalysis] = None
+    ) -> Dict[str, Any]:
+        """
+        Genera documentación usando IA basada en el código parseado.
+        Las secciones se generan en paralelo y se registra, para cada una,
+        los modelos utilizados y su latencia.
+        """
+        complexity_score = analysis.complexity_score if analysis else None
+        generators = {
+            "readme": (request.generate_readme, self._generate_readme),
+            "comments": (request.generate_comments, self._generate_comments),
+            "architecture": (request.generate_architecture, self._generate_architecture),
+            "checklist": (request.generate_checklist, self._generate_checklist),
+        }
+        sections = {
+            section: self._new_stats()
+            for section, (enabled, _) in generators.items() if enabled
+        }
 
-        if request.generate_checklist:
-            documentation["checklist"] = await self._generate_checklist(parsed_code)
+        async def run_section(section: str) -> Any:
+            start = time.perf_counter()
+            try:
+                return await generators[section][1](parsed_code, complexity_score, sections[section])
+            finally:
+                sections[section]["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
 
+        results = await asyncio.gather(*(run_section(section) for section in sections))
+
+        documentation: Dict[str, Any] = dict(zip(sections, results))
+        documentation["metadata"] = {"sections": sections}
         return documentation
 
-    async def _generate_readme(self, parsed_code: Dict[str, Any]) -> str:
+    async def _complete(
+        self,
+        section: str,
+        prompt: str,
+        validate: Callable[[str], Any],
+        complexity_score: Optional[float],
+        stats: Dict[str, Any]
+    ) -> Any:
+        """
+        Ejecuta un prompt con el modelo elegido por el router y valida la
+        respuesta. Si la validación falla se reintenta con el siguiente nivel;
+        si falla en el último nivel se propaga el ValueError del validador.
+        """
+        tier = self.router.select_tier(section, self._estimate_tokens(prompt), complexity_score)
+
+        while True:
+            model = self.router.model_for(tier)
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            stats["calls"] += 1
+            if model not in stats["models"]:
+                stats["models"].append(model)
+
+            try:
+                return validate(response.choices[0].message.content or "")
+            except ValueError:
+                if tier >= self.router.max_tier:
+                    raise
+                tier += 1
+                stats["escalations"] += 1
+
+    def _compact_code(self, parsed_code: Dict[str, Any]) -> str:
+        """
+        Resume el resultado del parseo para los prompts: solo nombres de
+        símbolos e imports por archivo, sin código fuente.
+        """
+        files = {}
+        for file in parsed_code.get("files", []):
+            files[file["path"]] = {
+                "functions": [
+                    f"{function['name']}({', '.join(function.get('args', []))})"
+                    for function in file.get("functions", [])
+                ],
+                "classes": [cls["name"] for cls in file.get("classes", [])],
+                "imports": sorted(set(file.get("imports", [])))
+            }
+        return json.dumps(files, ensure_ascii=False, separators=(",", ":"))
+
+    async def _generate_readme(
+        self,
+        parsed_code: Dict[str, Any],
+        complexity_score: Optional[float] = None,
+        stats: Optional[Dict[str, Any]] = None
+    ) -> str:
         prompt = f"""
         Genera un README.md completo para el siguiente proyecto:
-        {parsed_code}
+        {self._compact_code(parsed_code)}
         
         El README debe incluir:
         - Descripción del proyecto
@@ -40,49 +148,238 @@ class AIService:
         - Estructura del proyecto
         - Tecnologías utilizadas
         """
-        
-        response = await self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return response.choices[0].message.content
 
-    async def _generate_comments(self, parsed_code: Dict[str, Any]) -> list:
-        prompt = f"""
-        Analiza el siguiente código y genera comentarios de documentación para las funciones que no los tienen:
-        {parsed_code}
+        try:
+            return await self._complete(
+                "readme", prompt, self._validate_readme, complexity_score, stats or self._new_stats()
+            )
+        except ValueError as e:
+            raise AIServiceError(f"README inválido: {e}")
+
+    def _validate_readme(self, content: str) -> str:
+        if not re.search(r"^#{1,6} ", content, re.MULTILINE):
+            raise ValueError("el README no contiene encabezados Markdown")
+        return content
+
+    def _new_stats(self) -> Dict[str, Any]:
+        return {"models": [], "calls": 0, "escalations": 0, "latency_ms": 0.0}
+
+    async def _generate_comments(
+        self,
+        parsed_code: Dict[str, Any],
+        complexity_score: Optional[float] = None,
+        stats: Optional[Dict[str, Any]] = None
+    ) -> List[dict]:
         """
-        
-        response = await self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}]
+        Genera docstrings solo para las funciones y clases sin documentar,
+        agrupándolas en lotes que se procesan en paralelo.
+        """
+        symbols = self._undocumented_symbols(parsed_code)
+        pending = [symbol for symbol in symbols if symbol["source_hash"] not in self._docstring_cache]
+
+        semaphore = asyncio.Semaphore(settings.AI_MAX_CONCURRENCY)
+        stats = stats or self._new_stats()
+
+        async def run_batch(batch: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                await self._generate_docstring_batch(batch, complexity_score, stats)
+
+        await asyncio.gather(*(run_batch(batch) for batch in self._batch_symbols(pending)))
+
+        comments = []
+        for symbol in symbols:
+            docstring = self._docstring_cache.get(symbol["source_hash"])
+            if docstring:
+                self._docstring_cache.move_to_end(symbol["source_hash"])
+                comments.append({
+                    "id": symbol["id"],
+                    "path": symbol["path"],
+                    "symbol": symbol["symbol"],
+                    "lineno": symbol["lineno"],
+                    "docstring": docstring
+                })
+        return comments
+
+    def _undocumented_symbols(self, parsed_code: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Selecciona del resultado del parseo las funciones y clases sin docstring.
+        Cada símbolo se identifica por ruta, nombre cualificado y línea, ya que
+        varias clases de un archivo pueden tener métodos con el mismo nombre.
+        """
+        symbols = []
+        for file in parsed_code.get("files", []):
+            for symbol in [*file.get("functions", []), *file.get("classes", [])]:
+                if symbol.get("docstring") is None and symbol.get("source"):
+                    name = symbol.get("qualname") or symbol["name"]
+                    symbols.append({
+                        "id": f"{file['path']}:{name}@{symbol.get('lineno')}",
+                        "path": file["path"],
+                        "symbol": name,
+                        "lineno": symbol.get("lineno"),
+                        "source": symbol["source"],
+                        "source_hash": symbol["source_hash"]
+                    })
+        return symbols
+
+    def _batch_symbols(self, symbols: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Agrupa los símbolos en lotes de aproximadamente COMMENTS_BATCH_TOKENS tokens.
+        """
+        batches: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_tokens = 0
+        seen = set()
+
+        for symbol in symbols:
+            # Símbolos con el mismo código comparten docstring
+            if symbol["source_hash"] in seen:
+                continue
+            seen.add(symbol["source_hash"])
+
+            tokens = self._estimate_tokens(symbol["source"])
+            if current and current_tokens + tokens > settings.COMMENTS_BATCH_TOKENS:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(symbol)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _generate_docstring_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        complexity_score: Optional[float],
+        stats: Dict[str, Any]
+    ) -> None:
+        symbols = "\n\n".join(
+            f"# id: {symbol['id']}\n{symbol['source']}"
+            for symbol in batch
         )
-        
-        return response.choices[0].message.content
+        prompt = f"""
+        Genera un docstring para cada uno de los siguientes símbolos sin documentar.
+        Responde únicamente con un objeto JSON con el formato
+        {{"docstrings": [{{"id": "...", "docstring": "..."}}]}},
+        usando como "id" el indicado en cada símbolo y sin incluir delimitadores
+        en el docstring.
+
+        {symbols}
+        """
+
+        try:
+            results = await self._complete(
+                "comments", prompt, self._parse_docstrings, complexity_score, stats
+            )
+        except ValueError as e:
+            print(f"Error parsing docstrings: {e}")
+            return
+
+        hashes = {symbol["id"]: symbol["source_hash"] for symbol in batch}
+        for result in results:
+            source_hash = hashes.get(result.get("id"))
+            docstring = result.get("docstring")
+            if not isinstance(docstring, str) or source_hash is None:
+                continue
+            self._cache_docstring(source_hash, docstring.strip())
+
+    def _parse_docstrings(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Interpreta la respuesta JSON de la IA, tolerando bloques de código markdown.
+        """
+        content = content.strip()
+        if content.startswith("```"):
+            content = content.split("\n", 1)[-1].rsplit("```", 1)[0]
+
+        data = json.loads(content)
+        if isinstance(data, dict):
+            data = data.get("docstrings", [])
+        if not isinstance(data, list):
+            raise ValueError("se esperaba una lista de docstrings")
+        return [item for item in data if isinstance(item, dict)]
+
+    def _cache_docstring(self, source_hash: str, docstring: str) -> None:
+        self._docstring_cache[source_hash] = docstring
+        self._docstring_cache.move_to_end(source_hash)
+        while len(self._docstring_cache) > settings.DOCSTRING_CACHE_SIZE:
+            self._docstring_cache.popitem(last=False)
+
+    def _estimate_tokens(self, text: str) -> int:
+        # Aproximación habitual de ~4 caracteres por token
+        return len(text) // 4 + 1
+
+    async def _generate_architecture(
+        self,
+        parsed_code: Dict[str, Any],
+        complexity_score: Optional[float] = None,
+        stats: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Genera el diagrama Mermaid localmente a partir del grafo de imports.
+        La IA solo se usa, si está habilitado, para anotar el diagrama.
+        """
+        graph = ImportGraph.from_parsed_code(parsed_code)
+        diagram = graph.to_mermaid()
+
+        if not settings.ARCHITECTURE_AI_ANNOTATIONS:
+            return diagram
 
-    async def _generate_architecture(self, parsed_code: Dict[str, Any]) -> str:
         prompt = f"""
-        Genera un diagrama de arquitectura en formato Mermaid.js para el siguiente proyecto:
-        {parsed_code}
+        Describe en un máximo de 5 líneas de texto plano la arquitectura que muestra
+        el siguiente diagrama Mermaid de dependencias entre paquetes:
+        {diagram}
+
+        Dependencias externas: {", ".join(sorted(graph.external))}
         """
-        
-        response = await self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return response.choices[0].message.content
 
-    async def _generate_checklist(self, parsed_code: Dict[str, Any]) -> list:
+        try:
+            annotation = await self._complete(
+                "architecture", prompt, self._validate_annotation, complexity_score, stats or self._new_stats()
+            )
+        except ValueError as e:
+            print(f"Error annotating architecture: {e}")
+            return diagram
+
+        # Las anotaciones se insertan como comentarios para que el diagrama siga siendo válido
+        comments = [f"%% {line.strip()}" for line in annotation.splitlines() if line.strip()]
+        header, _, body = diagram.partition("\n")
+        return "\n".join([header, *comments, body])
+
+    def _validate_annotation(self, content: str) -> str:
+        if not content.strip():
+            raise ValueError("anotación vacía")
+        return content
+
+    async def _generate_checklist(
+        self,
+        parsed_code: Dict[str, Any],
+        complexity_score: Optional[float] = None,
+        stats: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
         prompt = f"""
         Genera una lista de verificación de buenas prácticas para el siguiente proyecto:
-        {parsed_code}
+        {self._compact_code(parsed_code)}
+
+        Responde con un elemento por línea, cada uno precedido de "- ".
         """
-        
-        response = await self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return response.choices[0].message.content 
\ No newline at end of file
+
+        try:
+            return await self._complete(
+                "checklist", prompt, self._parse_checklist, complexity_score, stats or self._new_stats()
+            )
+        except ValueError as e:
+            raise AIServiceError(f"Checklist inválida: {e}")
+
+    def _parse_checklist(self, content: str) -> List[str]:
+        """
+        Convierte la respuesta en una lista de elementos, aceptando viñetas,
+        casillas de verificación y listas numeradas.
+        """
+        items = []
+        for line in content.splitlines():
+            match = re.match(r"^\s*(?:[-*+]|\d+[.)])\s+(?:\[[ xX]\]\s*)?(.+)$", line)
+            if match:
+                items.append(match.group(1).strip())
+        if not items:
+            raise ValueError("la respuesta no contiene elementos de lista")
+        return items
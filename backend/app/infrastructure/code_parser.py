@@ -1,55 +1,86 @@
 import ast
-from typing import Dict, Any, List
+import copy
+import hashlib
+from typing import Dict, Any, List, Optional, AsyncIterator, Iterator, Tuple
 import re
+from app.core.config import settings
+
+PARSEABLE_EXTENSIONS = (".py", ".js", ".ts")
+# Máximo de caracteres de código conservados por símbolo (~4 caracteres por token)
+MAX_SYMBOL_SOURCE_CHARS = settings.COMMENTS_BATCH_TOKENS * 4
 
 class CodeParser:
     def parse_code(self, repo_content: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parsea el código del repositorio y extrae información relevante.
         """
-        parsed_data = {
-            "files": [],
-            "functions": [],
-            "classes": [],
-            "imports": [],
-            "structure": {}
-        }
+        parsed_data = self._empty_result()
 
         for item in repo_content["contents"]:
             if item["type"] == "file":
-                file_data = self._parse_file(item)
-                if file_data:
-                    parsed_data["files"].append(file_data)
-                    parsed_data["functions"].extend(file_data.get("functions", []))
-                    parsed_data["classes"].extend(file_data.get("classes", []))
-                    parsed_data["imports"].extend(file_data.get("imports", []))
+                self._add_file(parsed_data, self._parse_file(item))
 
         return parsed_data
 
-    def _parse_file(self, file_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def collect(self, parsed_files: AsyncIterator[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Parsea un archivo individual y extrae su estructura.
+        Agrega los archivos ya parseados que produce un pipeline en streaming.
         """
-        if not file_data["name"].endswith((".py", ".js", ".ts")):
-            return None
+        parsed_data = self._empty_result()
+
+        async for file_data in parsed_files:
+            self._add_file(parsed_data, file_data)
+
+        return parsed_data
+
+    def can_parse(self, filename: str) -> bool:
+        """
+        Determina si el parser soporta el archivo según su extensión.
+        """
+        return filename.endswith(PARSEABLE_EXTENSIONS)
 
-        content = file_data.get("content", "")
-        if not content:
+    def parse_file(self, name: str, path: str, content: str) -> Optional[Dict[str, Any]]:
+        """
+        Parsea el contenido de un archivo y extrae su estructura.
+        """
+        if not self.can_parse(name) or not content:
             return None
 
         parsed = {
-            "name": file_data["name"],
-            "path": file_data["path"],
+            "name": name,
+            "path": path,
             "functions": [],
             "classes": [],
             "imports": []
         }
 
-        if file_data["name"].endswith(".py"):
+        if name.endswith(".py"):
             return self._parse_python_file(content, parsed)
         else:
             return self._parse_js_file(content, parsed)
 
+    def _empty_result(self) -> Dict[str, Any]:
+        return {
+            "files": [],
+            "functions": [],
+            "classes": [],
+            "imports": [],
+            "structure": {}
+        }
+
+    def _add_file(self, parsed_data: Dict[str, Any], file_data: Optional[Dict[str, Any]]) -> None:
+        if file_data:
+            parsed_data["files"].append(file_data)
+            parsed_data["functions"].extend(file_data.get("functions", []))
+            parsed_data["classes"].extend(file_data.get("classes", []))
+            parsed_data["imports"].extend(file_data.get("imports", []))
+
+    def _parse_file(self, file_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Parsea un archivo individual y extrae su estructura.
+        """
+        return self.parse_file(file_data["name"], file_data["path"], file_data.get("content", ""))
+
     def _parse_python_file(self, content: str, parsed: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parsea un archivo Python usando ast.
@@ -57,18 +88,22 @@ class CodeParser:
         try:
             tree = ast.parse(content)
             
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
-                    parsed["functions"].append({
+            for node, qualname in self._walk_python(tree):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    parsed["functions"].append(self._with_source({
                         "name": node.name,
+                        "qualname": qualname,
                         "docstring": ast.get_docstring(node),
                         "args": [arg.arg for arg in node.args.args],
-                        "returns": self._get_return_type(node)
-                    })
+                        "returns": self._get_return_type(node),
+                        "lineno": node.lineno
+                    }, ast.get_source_segment(content, node)))
                 elif isinstance(node, ast.ClassDef):
-                    parsed["classes"].append({
+                    parsed["classes"].append(self._with_source({
                         "name": node.name,
+                        "qualname": qualname,
                         "docstring": ast.get_docstring(node),
+                        "lineno": node.lineno,
                         "methods": [
                             {
                                 "name": method.name,
@@ -76,13 +111,15 @@ class CodeParser:
                                 "args": [arg.arg for arg in method.args.args]
                             }
                             for method in node.body
-                            if isinstance(method, ast.FunctionDef)
+                            if isinstance(method, (ast.FunctionDef, ast.AsyncFunctionDef))
                         ]
-                    })
+                    }, ast.get_source_segment(content, node), self._python_class_outline(node)))
                 elif isinstance(node, ast.Import):
                     parsed["imports"].extend([name.name for name in node.names])
                 elif isinstance(node, ast.ImportFrom):
-                    parsed["imports"].extend([f"{node.module}.{name.name}" for name in node.names])
+                    # Conservar el nivel de los imports relativos (from .. import x)
+                    prefix = "." * node.level + (f"{node.module}." if node.module else "")
+                    parsed["imports"].extend([f"{prefix}{name.name}" for name in node.names])
 
         except Exception as e:
             print(f"Error parsing Python file: {e}")
@@ -90,6 +127,20 @@ class CodeParser:
 
         return parsed
 
+    def _walk_python(self, node: ast.AST, prefix: str = "") -> Iterator[Tuple[ast.AST, str]]:
+        """
+        Recorre el árbol como `ast.walk`, junto con el nombre cualificado de
+        cada nodo (por ejemplo `Clase.metodo`).
+        """
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = f"{prefix}{child.name}"
+                yield child, qualname
+                yield from self._walk_python(child, f"{qualname}.")
+            else:
+                yield child, prefix
+                yield from self._walk_python(child, prefix)
+
     def _parse_js_file(self, content: str, parsed: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parsea un archivo JavaScript/TypeScript usando expresiones regulares.
@@ -100,11 +151,13 @@ class CodeParser:
         
         for func in functions:
             name, args, body = func.groups()
-            parsed["functions"].append({
+            parsed["functions"].append(self._with_source({
                 "name": name,
+                "docstring": self._get_jsdoc(content, func.start()),
                 "args": [arg.strip() for arg in args.split(",") if arg.strip()],
-                "body": body.strip()
-            })
+                "body": body.strip(),
+                "lineno": content.count("\n", 0, func.start()) + 1
+            }, func.group(0)))
 
         # Extraer clases
         class_pattern = r"class\s+(\w+)\s*{([^}]*)}"
@@ -112,10 +165,18 @@ class CodeParser:
         
         for cls in classes:
             name, body = cls.groups()
-            parsed["classes"].append({
+            methods = self._extract_js_methods(body)
+            outline = "\n".join(
+                [f"class {name} {{"]
+                + [f"  {method['name']}({', '.join(method['args'])}) {{ ... }}" for method in methods]
+                + ["}"]
+            )
+            parsed["classes"].append(self._with_source({
                 "name": name,
-                "methods": self._extract_js_methods(body)
-            })
+                "docstring": self._get_jsdoc(content, cls.start()),
+                "lineno": content.count("\n", 0, cls.start()) + 1,
+                "methods": methods
+            }, cls.group(0), outline))
 
         # Extraer imports
         import_pattern = r"import\s+(?:{[^}]*}|\*\s+as\s+\w+|\w+)\s+from\s+['\"]([^'\"]+)['\"]"
@@ -137,13 +198,62 @@ class CodeParser:
             "body": method.group(3).strip()
         } for method in methods]
 
-    def _get_return_type(self, node: ast.FunctionDef) -> str:
+    def _with_source(
+        self,
+        symbol: Dict[str, Any],
+        source: Optional[str],
+        outline: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Añade el hash del código fuente del símbolo. El código solo se conserva
+        para los símbolos sin documentar, que son los que se envían a la IA.
+        Para las clases se guarda solo su esquema (`outline`), ya que los
+        métodos se extraen como funciones propias, y el código conservado se
+        trunca a MAX_SYMBOL_SOURCE_CHARS.
+        """
+        source = source or ""
+        symbol["source_hash"] = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        if symbol.get("docstring") is None:
+            symbol["source"] = (outline if outline is not None else source)[:MAX_SYMBOL_SOURCE_CHARS]
+        return symbol
+
+    def _python_class_outline(self, node: ast.ClassDef) -> str:
+        """
+        Reduce una clase Python a su cabecera, sus atributos y las firmas de
+        sus métodos, sin los cuerpos.
+        """
+        body: List[ast.stmt] = []
+        for statement in node.body:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                method = copy.copy(statement)
+                method.body = [ast.Expr(ast.Constant(...))]
+                body.append(method)
+            elif isinstance(statement, (ast.Assign, ast.AnnAssign)):
+                body.append(statement)
+
+        outline = copy.copy(node)
+        outline.body = body or [ast.Pass()]
+        return ast.unparse(outline)
+
+    def _get_jsdoc(self, content: str, start: int) -> Optional[str]:
+        """
+        Extrae el comentario JSDoc inmediatamente anterior a una declaración.
+        """
+        end = start
+        while end > 0 and content[end - 1].isspace():
+            end -= 1
+        if end < 2 or not content.startswith("*/", end - 2):
+            return None
+        comment_start = content.rfind("/**", 0, end - 2)
+        if comment_start == -1:
+            return None
+        lines = content[comment_start + 3:end - 2].splitlines()
+        return "\n".join(line.strip().lstrip("*").strip() for line in lines).strip() or None
+
+    def _get_return_type(self, node: ast.FunctionDef) -> Optional[str]:
         """
         Extrae el tipo de retorno de una función Python.
         """
         if node.returns:
-            if isinstance(node.returns, ast.Name):
-                return node.returns.id
-            elif isinstance(node.returns, ast.Subscript):
-                return f"{node.returns.value.id}[{node.returns.slice.value.id}]"
+            return ast.unparse(node.returns)
         return None 
\ No newline at end of file
@@ -0,0 +1,237 @@
+import sys
+import base64
+from array import array
+from bisect import bisect_right
+from typing import Dict, Any, Callable, Iterator, List, NamedTuple, Optional
+from app.infrastructure.path_filter import PathFilter
+
+# Límites superiores (exclusivos) de los buckets del histograma de tamaños
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 * 1024)
+SIZE_BUCKET_LABELS = ("<1KB", "<10KB", "<100KB", "<1MB", ">=1MB")
+
+_CATEGORY_CODES = {None: 0, "main": 1, "source": 2, "config": 3}
+_CATEGORY_NAMES = {code: name for name, code in _CATEGORY_CODES.items()}
+_SHA_BYTES = 20
+# Columnas del índice, en el orden en que se serializan
+_COLUMNS = (
+    "dir_codes", "name_codes", "depths", "extension_codes",
+    "sizes", "categories", "shas", "included"
+)
+
+class IndexedFile(NamedTuple):
+    """Vista ligera de un archivo del índice, compatible con `FileInfo` en lectura."""
+    path: str
+    name: str
+    size: int
+    sha: str
+    category: Optional[str]
+
+class FileIndex:
+    """
+    Índice columnar de los archivos de un repositorio, construido una sola vez
+    mientras se lista el árbol.
+
+    Cada archivo ocupa una posición en arrays compactos (directorio, nombre,
+    profundidad, extensión, tamaño, categoría, SHA del blob y si cumple las
+    reglas de inclusión de la petición). Los nombres de
+    directorio, archivo y extensión se internan y se guardan como códigos
+    enteros, de modo que el índice no crea objetos por archivo. Se persiste
+    con `to_dict` en ese mismo formato columnar y se reconstruye con `from_dict`.
+    """
+
+    def __init__(self):
+        self._names: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._extensions: Dict[str, int] = {"": 0}
+        self.extensions: List[str] = [""]
+        self._directories: Dict[str, int] = {"": 0}
+        self.directories: List[str] = [""]
+
+        self.dir_codes = array("i")
+        self.name_codes = array("i")
+        self.depths = array("H")
+        self.extension_codes = array("H")
+        self.sizes = array("q")
+        self.categories = array("b")
+        self.shas = bytearray()
+        self.included = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.name_codes)
+
+    def add_directory(self, path: str) -> int:
+        code = self._directories.get(path)
+        if code is None:
+            code = self._directories[path] = len(self.directories)
+            self.directories.append(path)
+        return code
+
+    def add_file(
+        self,
+        path: str,
+        size: Optional[int] = None,
+        sha: Optional[str] = None,
+        included: bool = True
+    ) -> None:
+        directory, _, name = path.rpartition("/")
+        dot = name.rfind(".")
+        extension = name[dot:] if dot > 0 else ""
+
+        self.dir_codes.append(self.add_directory(directory))
+        self.name_codes.append(self._intern(self._names, self.names, name))
+        self.depths.append(path.count("/") + 1)
+        self.extension_codes.append(self._intern(self._extensions, self.extensions, extension))
+        self.sizes.append(size or 0)
+        self.categories.append(_CATEGORY_CODES[PathFilter.classify(name)])
+        self.shas.extend(bytes.fromhex(sha) if sha else bytes(_SHA_BYTES))
+        self.included.append(included)
+
+    def path(self, position: int) -> str:
+        directory = self.directories[self.dir_codes[position]]
+        name = self.names[self.name_codes[position]]
+        return f"{directory}/{name}" if directory else name
+
+    def file(self, position: int) -> IndexedFile:
+        return IndexedFile(
+            path=self.path(position),
+            name=self.names[self.name_codes[position]],
+            size=self.sizes[position],
+            sha=self.shas[position * _SHA_BYTES:(position + 1) * _SHA_BYTES].hex(),
+            category=_CATEGORY_NAMES[self.categories[position]]
+        )
+
+    def iter_files(self, category: Optional[str] = None) -> Iterator[IndexedFile]:
+        """
+        Recorre los archivos del índice, opcionalmente filtrados por categoría.
+        """
+        if category is None:
+            return (self.file(position) for position in range(len(self)))
+        code = _CATEGORY_CODES[category]
+        return (
+            self.file(position)
+            for position, file_category in enumerate(self.categories)
+            if file_category == code
+        )
+
+    def iter_included(self) -> Iterator[IndexedFile]:
+        """
+        Recorre los archivos que cumplen las reglas de inclusión: los que se parsean.
+        """
+        return (self.file(position) for position, included in enumerate(self.included) if included)
+
+    def iter_named(self, predicate: Callable[[str], bool]) -> Iterator[IndexedFile]:
+        """
+        Recorre los archivos cuyo nombre cumple `predicate`. El predicado se
+        evalúa una vez por nombre internado, no por archivo.
+        """
+        codes = {code for code, name in enumerate(self.names) if predicate(name)}
+        return (
+            self.file(position)
+            for position, name_code in enumerate(self.name_codes)
+            if name_code in codes
+        )
+
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Calcula todas las estadísticas del repositorio en una única pasada
+        sobre las columnas del índice.
+        """
+        files_by_extension: Dict[int, int] = {}
+        bytes_by_extension: Dict[int, int] = {}
+        bytes_by_directory: Dict[str, int] = {}
+        histograms: Dict[str, List[int]] = {}
+        category_counts = [0] * len(_CATEGORY_CODES)
+        main_files = set()
+        main_code = _CATEGORY_CODES["main"]
+        max_depth = 0
+        total_bytes = 0
+
+        # Directorio de primer nivel de cada directorio interno
+        top_levels = [directory.split("/", 1)[0] for directory in self.directories]
+
+        for dir_code, name_code, depth, extension_code, size, category in zip(
+            self.dir_codes, self.name_codes, self.depths, self.extension_codes, self.sizes, self.categories
+        ):
+            total_bytes += size
+            if depth > max_depth:
+                max_depth = depth
+            category_counts[category] += 1
+            files_by_extension[extension_code] = files_by_extension.get(extension_code, 0) + 1
+            bytes_by_extension[extension_code] = bytes_by_extension.get(extension_code, 0) + size
+            top_level = top_levels[dir_code] or "."
+            bytes_by_directory[top_level] = bytes_by_directory.get(top_level, 0) + size
+            histogram = histograms.get(top_level)
+            if histogram is None:
+                histogram = histograms[top_level] = [0] * len(SIZE_BUCKET_LABELS)
+            histogram[bisect_right(SIZE_BUCKETS, size)] += 1
+            if category == main_code:
+                main_files.add(self.names[name_code])
+
+        return {
+            "file_count": len(self),
+            "directory_count": len(self.directories) - 1,
+            "max_depth": max_depth,
+            "total_bytes": total_bytes,
+            "main_file_count": category_counts[_CATEGORY_CODES["main"]],
+            "source_file_count": category_counts[_CATEGORY_CODES["source"]],
+            "config_file_count": category_counts[_CATEGORY_CODES["config"]],
+            "main_files": sorted(main_files),
+            "files_by_extension": {
+                self.extensions[code]: count for code, count in sorted(files_by_extension.items()) if code
+            },
+            "bytes_by_extension": {
+                self.extensions[code]: size for code, size in sorted(bytes_by_extension.items()) if code
+            },
+            "bytes_by_directory": dict(sorted(bytes_by_directory.items())),
+            "size_histogram_by_directory": {
+                directory: dict(zip(SIZE_BUCKET_LABELS, counts))
+                for directory, counts in sorted(histograms.items())
+            },
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializa el índice tal cual: tablas internadas y columnas codificadas
+        en base64, sin crear objetos por archivo.
+        """
+        return {
+            "byteorder": sys.byteorder,
+            "names": self.names,
+            "extensions": self.extensions,
+            "directories": self.directories,
+            "columns": {
+                column: base64.b64encode(getattr(self, column)).decode("ascii")
+                for column in _COLUMNS
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileIndex":
+        """
+        Reconstruye un índice serializado con `to_dict`.
+        """
+        index = cls()
+        index.names = list(data["names"])
+        index.extensions = list(data["extensions"])
+        index.directories = list(data["directories"])
+        index._names = {name: code for code, name in enumerate(index.names)}
+        index._extensions = {extension: code for code, extension in enumerate(index.extensions)}
+        index._directories = {directory: code for code, directory in enumerate(index.directories)}
+
+        for column in _COLUMNS:
+            values = getattr(index, column)
+            raw = base64.b64decode(data["columns"][column])
+            if isinstance(values, bytearray):
+                values.extend(raw)
+                continue
+            values.frombytes(raw)
+            if data["byteorder"] != sys.byteorder:
+                values.byteswap()
+        return index
+
+    def _intern(self, codes: Dict[str, int], values: List[str], value: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
@@ -0,0 +1,121 @@
+import asyncio
+from typing import Dict, Any, AsyncIterator, Iterable, Optional
+from app.domain.models import Repository
+from app.core.config import settings
+from app.infrastructure.code_parser import CodeParser
+from app.infrastructure.file_index import IndexedFile
+from app.infrastructure.repository_analyzer import RepositoryAnalyzer
+
+class _WorkerDone:
+    """Marca el fin de un worker de descarga, con el error que lo detuvo si lo hubo."""
+
+    def __init__(self, error: Optional[BaseException] = None):
+        self.error = error
+
+class FilePipeline:
+    """
+    Pipeline en streaming fetch → filter → parse.
+
+    Las etapas se comunican mediante colas acotadas, de modo que en memoria solo
+    hay como máximo `queue_size` archivos pendientes de descarga y `queue_size`
+    contenidos pendientes de parseo. El contenido de cada archivo se libera en
+    cuanto el `CodeParser` extrae sus símbolos.
+    """
+
+    def __init__(
+        self,
+        analyzer: RepositoryAnalyzer,
+        parser: CodeParser,
+        max_file_size: int = settings.MAX_FILE_SIZE,
+        queue_size: int = settings.PIPELINE_QUEUE_SIZE,
+        concurrency: int = settings.PIPELINE_FETCH_CONCURRENCY
+    ):
+        self.analyzer = analyzer
+        self.parser = parser
+        self.max_file_size = max_file_size
+        self.queue_size = queue_size
+        self.concurrency = max(1, concurrency)
+
+    def accepts(self, file_info: IndexedFile) -> bool:
+        """
+        Filtro previo a la descarga: descarta archivos no parseables o cuyo
+        tamaño declarado supera `max_file_size`.
+        """
+        if file_info.size is not None and file_info.size > self.max_file_size:
+            return False
+        return self.parser.can_parse(file_info.name)
+
+    @staticmethod
+    def is_binary(data: bytes) -> bool:
+        """
+        Detecta contenido binario inspeccionando los primeros bytes del archivo.
+        """
+        sample = data[:settings.BINARY_SNIFF_BYTES]
+        if b"\x00" in sample:
+            return True
+        try:
+            sample.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # Un carácter multibyte cortado al final de la muestra no indica binario
+            return len(data) <= len(sample) or e.start < len(sample) - 3
+        return False
+
+    async def run(self, repository: Repository, files: Iterable[IndexedFile]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Descarga y parsea los archivos del repositorio, produciendo el resultado
+        del parseo de cada archivo a medida que está disponible.
+        """
+        owner, repo = self.analyzer.get_owner_and_repo(repository)
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        client = self.analyzer.client
+
+        async def produce():
+            for file_info in files:
+                if self.accepts(file_info):
+                    await pending.put(file_info)
+            for _ in range(self.concurrency):
+                await pending.put(None)
+
+        async def fetch():
+            try:
+                while True:
+                    file_info = await pending.get()
+                    if file_info is None:
+                        break
+                    data = await self.analyzer.fetch_file_bytes(
+                        client, owner, repo, file_info.path, repository.branch, self.max_file_size
+                    )
+                    if data is None or self.is_binary(data):
+                        continue
+                    await fetched.put((file_info, data.decode("utf-8", errors="replace")))
+            except Exception as e:
+                await fetched.put(_WorkerDone(e))
+            else:
+                await fetched.put(_WorkerDone())
+
+        tasks = [asyncio.create_task(produce())]
+        tasks.extend(asyncio.create_task(fetch()) for _ in range(self.concurrency))
+
+        try:
+            running = self.concurrency
+            while running:
+                item = await fetched.get()
+                if isinstance(item, _WorkerDone):
+                    if item.error is not None:
+                        raise item.error
+                    running -= 1
+                    continue
+
+                file_info, content = item
+                item = None
+                parsed = self.parser.parse_file(file_info.name, file_info.path, content)
+                # Liberar el contenido en cuanto se extraen los símbolos
+                content = None
+                if parsed:
+                    yield parsed
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
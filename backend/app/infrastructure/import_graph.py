@@ -0,0 +1,220 @@
+import posixpath
+from typing import Dict, Any, List, Optional, Set
+
+PYTHON_EXTENSIONS = (".py",)
+JS_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+ROOT_PACKAGE = "."
+
+class ImportGraph:
+    """
+    Grafo de dependencias entre módulos construido a partir de los imports
+    que el `CodeParser` extrae de cada archivo.
+
+    Los nodos son rutas de archivo del repositorio; los imports que no se
+    resuelven a un archivo del propio repositorio se consideran externos.
+    """
+
+    def __init__(self, files: List[Dict[str, Any]]):
+        self.modules: Set[str] = {file["path"] for file in files}
+        self.edges: Dict[str, Set[str]] = {path: set() for path in self.modules}
+        self.external: Set[str] = set()
+        self._python_index = self._build_python_index()
+
+        for file in files:
+            for name in file.get("imports", []):
+                target = self._resolve(file["path"], name)
+                if target is None:
+                    package = self._external_package(file["path"], name)
+                    if package:
+                        self.external.add(package)
+                elif target != file["path"]:
+                    self.edges[file["path"]].add(target)
+
+    @classmethod
+    def from_parsed_code(cls, parsed_code: Dict[str, Any]) -> "ImportGraph":
+        return cls(parsed_code.get("files", []))
+
+    def package_graph(self) -> Dict[str, Dict[str, int]]:
+        """
+        Colapsa el grafo a nivel de paquete (directorio), contando cuántos
+        imports hay entre cada par de paquetes.
+        """
+        packages: Dict[str, Dict[str, int]] = {}
+        for source, targets in self.edges.items():
+            source_package = self._package_of(source)
+            edges = packages.setdefault(source_package, {})
+            for target in targets:
+                target_package = self._package_of(target)
+                packages.setdefault(target_package, {})
+                if target_package != source_package:
+                    edges[target_package] = edges.get(target_package, 0) + 1
+        return packages
+
+    def find_cycles(self, graph: Optional[Dict[str, Dict[str, int]]] = None) -> List[List[str]]:
+        """
+        Detecta ciclos de dependencias (componentes fuertemente conexos con más
+        de un nodo) usando el algoritmo de Tarjan en su versión iterativa.
+        """
+        graph = self.package_graph() if graph is None else graph
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        cycles: List[List[str]] = []
+        counter = 0
+
+        for root in sorted(graph):
+            if root in index:
+                continue
+            work = [(root, iter(sorted(graph[root])))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, neighbours = work[-1]
+                advanced = False
+                for neighbour in neighbours:
+                    if neighbour not in index:
+                        index[neighbour] = lowlink[neighbour] = counter
+                        counter += 1
+                        stack.append(neighbour)
+                        on_stack.add(neighbour)
+                        work.append((neighbour, iter(sorted(graph.get(neighbour, {})))))
+                        advanced = True
+                        break
+                    if neighbour in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbour])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        cycles.append(sorted(component))
+
+        return sorted(cycles)
+
+    def to_mermaid(self) -> str:
+        """
+        Genera un diagrama Mermaid determinista del grafo de paquetes.
+        Los paquetes que forman parte de un ciclo se resaltan.
+        """
+        graph = self.package_graph()
+        lines = ["graph TD"]
+        if not graph:
+            lines.append('    empty["Sin módulos analizados"]')
+            return "\n".join(lines)
+
+        ids = {package: f"p{i}" for i, package in enumerate(sorted(graph))}
+        for package, node_id in ids.items():
+            label = "(raíz)" if package == ROOT_PACKAGE else package.replace('"', "#quot;")
+            lines.append(f'    {node_id}["{label}"]')
+
+        for source in sorted(graph):
+            for target, count in sorted(graph[source].items()):
+                lines.append(f"    {ids[source]} -->|{count}| {ids[target]}")
+
+        cyclic = sorted({package for cycle in self.find_cycles(graph) for package in cycle})
+        if cyclic:
+            lines.append("    classDef cycle fill:#fdd,stroke:#c00")
+            lines.append(f"    class {','.join(ids[package] for package in cyclic)} cycle")
+
+        return "\n".join(lines)
+
+    def _package_of(self, path: str) -> str:
+        return posixpath.dirname(path) or ROOT_PACKAGE
+
+    def _build_python_index(self) -> Dict[str, str]:
+        """
+        Indexa los módulos Python por nombre con puntos. Además del nombre
+        completo se registran los sufijos que empiezan en un directorio, para
+        soportar layouts como src/ o backend/ sin confundir módulos locales
+        de un solo nivel con la librería estándar.
+        """
+        candidates: Dict[str, Set[str]] = {}
+        full_names: Dict[str, str] = {}
+        for path in sorted(self.modules):
+            if not path.endswith(PYTHON_EXTENSIONS):
+                continue
+            parts = self._python_module_parts(path)
+            if not parts:
+                continue
+            full_names[".".join(parts)] = path
+            is_package = path.endswith("__init__.py")
+            for start in range(1, len(parts)):
+                if len(parts) - start >= 2 or is_package:
+                    candidates.setdefault(".".join(parts[start:]), set()).add(path)
+
+        index = {name: next(iter(paths)) for name, paths in candidates.items() if len(paths) == 1}
+        index.update(full_names)
+        return index
+
+    def _python_module_parts(self, path: str) -> List[str]:
+        parts = path[:-len(".py")].split("/")
+        if parts[-1] == "__init__":
+            parts.pop()
+        return parts
+
+    def _resolve(self, source: str, name: str) -> Optional[str]:
+        if source.endswith(PYTHON_EXTENSIONS):
+            return self._resolve_python(source, name)
+        if source.endswith(JS_EXTENSIONS):
+            return self._resolve_js(source, name)
+        return None
+
+    def _external_package(self, source: str, name: str) -> Optional[str]:
+        """
+        Nombre del paquete externo de un import no resuelto. Los imports
+        relativos que no se resuelven apuntan a archivos ausentes del propio
+        repositorio y no se registran como externos.
+        """
+        if name.startswith("."):
+            return None
+        if source.endswith(JS_EXTENSIONS):
+            parts = name.split("/")
+            # Paquetes npm con scope: @scope/nombre
+            return "/".join(parts[:2]) if name.startswith("@") else parts[0]
+        return name.split(".")[0]
+
+    def _resolve_python(self, source: str, name: str) -> Optional[str]:
+        if name.startswith("."):
+            level = len(name) - len(name.lstrip("."))
+            package = self._python_module_parts(source)
+            if not source.endswith("__init__.py"):
+                package = package[:-1]
+            if level - 1 > len(package):
+                return None
+            base = package[:len(package) - (level - 1)]
+            name = ".".join(base + [name[level:]]) if name[level:] else ".".join(base)
+
+        parts = name.split(".")
+        for end in range(len(parts), 0, -1):
+            target = self._python_index.get(".".join(parts[:end]))
+            if target is not None:
+                return target
+        return None
+
+    def _resolve_js(self, source: str, name: str) -> Optional[str]:
+        if not name.startswith("."):
+            return None
+
+        base = posixpath.normpath(posixpath.join(posixpath.dirname(source), name))
+        candidates = [base]
+        candidates.extend(base + extension for extension in JS_EXTENSIONS)
+        candidates.extend(f"{base}/index{extension}" for extension in JS_EXTENSIONS)
+        for candidate in candidates:
+            if candidate in self.modules:
+                return candidate
+        return None
@@ -0,0 +1,297 @@
+import re
+import json
+import asyncio
+import posixpath
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+from app.core.config import settings
+from app.infrastructure.file_index import FileIndex
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+# Resultado de un parser: (nombre declarado del paquete, dependencias)
+ParsedManifest = Tuple[Optional[str], List[str]]
+
+_REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+_REQUIREMENTS_FILE = re.compile(r"^requirements(?:[-_.][\w.-]*)?\.txt$")
+# Los requisitos marcados "// indirect" son transitivos y no se declaran como directos
+_GO_REQUIRE = re.compile(r"^\s*(?:require\s+)?([^\s()]+)\s+v\S+(?![^\n]*//\s*indirect)", re.MULTILINE)
+_GO_REQUIRE_BLOCK = re.compile(r"^require\s*\((.*?)^\)", re.MULTILINE | re.DOTALL)
+_GO_SINGLE_REQUIRE = re.compile(r"^require\s+([^\s(]+)\s+v\S+(?![^\n]*//\s*indirect)", re.MULTILINE)
+_GO_MODULE = re.compile(r"^module\s+(\S+)", re.MULTILINE)
+_POM_BLOCK = re.compile(r"<(parent|dependencies|dependencyManagement|build|profiles|reporting)\b.*?</\1>", re.DOTALL)
+_POM_DEPENDENCY = re.compile(r"<dependency>(.*?)</dependency>", re.DOTALL)
+_POM_GROUP = re.compile(r"<groupId>\s*([^<\s]+)\s*</groupId>")
+_POM_ARTIFACT = re.compile(r"<artifactId>\s*([^<\s]+)\s*</artifactId>")
+_GRADLE_DEPENDENCY = re.compile(
+    r"\b(?:implementation|api|compile|compileOnly|runtimeOnly|annotationProcessor|kapt|"
+    r"testImplementation|testCompileOnly|testRuntimeOnly)\b\s*\(?\s*['\"]([^:'\"\s]+):([^:'\"\s]+)"
+)
+_GEMFILE_GEM = re.compile(r"^\s*gem\s+['\"]([^'\"]+)['\"]", re.MULTILINE)
+_GEMFILE_LOCK_SPEC = re.compile(r"^ {4}([A-Za-z0-9_.-]+) \(", re.MULTILINE)
+_YARN_ENTRY = re.compile(r"^\"?((?:@[^/\s\"]+/)?[^@\s\",]+)@", re.MULTILINE)
+_PNPM_PACKAGE = re.compile(r"^ {2}['\"]?/?((?:@[^/\s]+/)?[^@/\s:'\"]+)[@/]", re.MULTILINE)
+
+def _normalize_python(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def _requirement_name(requirement: str) -> Optional[str]:
+    match = _REQUIREMENT_NAME.match(requirement)
+    return _normalize_python(match.group(1)) if match else None
+
+def _load_toml(content: str) -> Dict[str, Any]:
+    return tomllib.loads(content)
+
+def _parse_requirements(content: str) -> ParsedManifest:
+    dependencies = []
+    for line in content.splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith(("#", "-")) or "://" in line.split("@", 1)[0]:
+            continue
+        name = _requirement_name(line)
+        if name:
+            dependencies.append(name)
+    return None, dependencies
+
+def _parse_pyproject(content: str) -> ParsedManifest:
+    data = _load_toml(content)
+    project = data.get("project", {})
+    poetry = data.get("tool", {}).get("poetry", {})
+
+    requirements = list(project.get("dependencies", []))
+    for extra in project.get("optional-dependencies", {}).values():
+        requirements.extend(extra)
+    for group in data.get("dependency-groups", {}).values():
+        requirements.extend(item for item in group if isinstance(item, str))
+    dependencies = [name for name in map(_requirement_name, requirements) if name]
+
+    poetry_tables = [poetry.get("dependencies", {}), poetry.get("dev-dependencies", {})]
+    poetry_tables.extend(group.get("dependencies", {}) for group in poetry.get("group", {}).values())
+    for table in poetry_tables:
+        dependencies.extend(_normalize_python(name) for name in table if name.lower() != "python")
+
+    return project.get("name") or poetry.get("name"), dependencies
+
+def _parse_pipfile(content: str) -> ParsedManifest:
+    data = _load_toml(content)
+    names = [*data.get("packages", {}), *data.get("dev-packages", {})]
+    return None, [_normalize_python(name) for name in names]
+
+def _parse_pipfile_lock(content: str) -> ParsedManifest:
+    data = json.loads(content)
+    names = [*data.get("default", {}), *data.get("develop", {})]
+    return None, [_normalize_python(name) for name in names]
+
+def _parse_poetry_lock(content: str) -> ParsedManifest:
+    data = _load_toml(content)
+    return None, [_normalize_python(package["name"]) for package in data.get("package", [])]
+
+def _parse_package_json(content: str) -> ParsedManifest:
+    data = json.loads(content)
+    dependencies = []
+    for key in ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies"):
+        dependencies.extend(data.get(key) or {})
+    return data.get("name"), dependencies
+
+def _parse_package_lock(content: str) -> ParsedManifest:
+    data = json.loads(content)
+    packages = data.get("packages")
+    if packages is not None:
+        # lockfileVersion 2/3: claves "node_modules/a/node_modules/b"
+        names = [path.rsplit("node_modules/", 1)[1] for path in packages if "node_modules/" in path]
+    else:
+        names = list(data.get("dependencies", {}))
+    return None, names
+
+def _parse_yarn_lock(content: str) -> ParsedManifest:
+    return None, [name for name in _YARN_ENTRY.findall(content) if name != "__metadata"]
+
+def _parse_pnpm_lock(content: str) -> ParsedManifest:
+    _, _, packages = content.partition("\npackages:")
+    packages = re.split(r"^\S", packages, maxsplit=1, flags=re.MULTILINE)[0]
+    return None, _PNPM_PACKAGE.findall(packages)
+
+def _parse_go_mod(content: str) -> ParsedManifest:
+    module = _GO_MODULE.search(content)
+    dependencies = _GO_SINGLE_REQUIRE.findall(content)
+    for block in _GO_REQUIRE_BLOCK.findall(content):
+        dependencies.extend(_GO_REQUIRE.findall(block))
+    return (module.group(1) if module else None), dependencies
+
+def _parse_pom(content: str) -> ParsedManifest:
+    dependencies = []
+    for block in _POM_DEPENDENCY.findall(content):
+        group, artifact = _POM_GROUP.search(block), _POM_ARTIFACT.search(block)
+        if artifact:
+            dependencies.append(f"{group.group(1)}:{artifact.group(1)}" if group else artifact.group(1))
+
+    # Las coordenadas propias están fuera de <parent>, <dependencies>, <build>...
+    project = _POM_BLOCK.sub("", content)
+    group, artifact = _POM_GROUP.search(project), _POM_ARTIFACT.search(project)
+    name = None
+    if artifact:
+        name = f"{group.group(1)}:{artifact.group(1)}" if group else artifact.group(1)
+    return name, dependencies
+
+def _parse_gradle(content: str) -> ParsedManifest:
+    return None, [f"{group}:{artifact}" for group, artifact in _GRADLE_DEPENDENCY.findall(content)]
+
+def _parse_cargo_toml(content: str) -> ParsedManifest:
+    data = _load_toml(content)
+    tables = [data.get(key, {}) for key in ("dependencies", "dev-dependencies", "build-dependencies")]
+    tables.append(data.get("workspace", {}).get("dependencies", {}))
+    for target in data.get("target", {}).values():
+        tables.extend(target.get(key, {}) for key in ("dependencies", "dev-dependencies", "build-dependencies"))
+    dependencies = [name for table in tables for name in table]
+    return data.get("package", {}).get("name"), dependencies
+
+def _parse_cargo_lock(content: str) -> ParsedManifest:
+    data = _load_toml(content)
+    return None, [package["name"] for package in data.get("package", [])]
+
+def _parse_gemfile(content: str) -> ParsedManifest:
+    return None, _GEMFILE_GEM.findall(content)
+
+def _parse_gemfile_lock(content: str) -> ParsedManifest:
+    return None, _GEMFILE_LOCK_SPEC.findall(content)
+
+def _parse_composer_json(content: str) -> ParsedManifest:
+    data = json.loads(content)
+    names = [*(data.get("require") or {}), *(data.get("require-dev") or {})]
+    return data.get("name"), [name for name in names if name != "php" and not name.startswith("ext-")]
+
+def _parse_composer_lock(content: str) -> ParsedManifest:
+    data = json.loads(content)
+    packages = [*(data.get("packages") or []), *(data.get("packages-dev") or [])]
+    return None, [package["name"] for package in packages if "name" in package]
+
+# Manifiestos reconocidos: nombre de archivo → (ecosistema, parser)
+MANIFEST_PARSERS: Dict[str, Tuple[str, Callable[[str], ParsedManifest]]] = {
+    "pyproject.toml": ("python", _parse_pyproject),
+    "Pipfile": ("python", _parse_pipfile),
+    "Pipfile.lock": ("python", _parse_pipfile_lock),
+    "poetry.lock": ("python", _parse_poetry_lock),
+    "package.json": ("node", _parse_package_json),
+    "package-lock.json": ("node", _parse_package_lock),
+    "npm-shrinkwrap.json": ("node", _parse_package_lock),
+    "yarn.lock": ("node", _parse_yarn_lock),
+    "pnpm-lock.yaml": ("node", _parse_pnpm_lock),
+    "go.mod": ("go", _parse_go_mod),
+    "pom.xml": ("java", _parse_pom),
+    "build.gradle": ("java", _parse_gradle),
+    "build.gradle.kts": ("java", _parse_gradle),
+    "Cargo.toml": ("rust", _parse_cargo_toml),
+    "Cargo.lock": ("rust", _parse_cargo_lock),
+    "Gemfile": ("ruby", _parse_gemfile),
+    "Gemfile.lock": ("ruby", _parse_gemfile_lock),
+    "composer.json": ("php", _parse_composer_json),
+    "composer.lock": ("php", _parse_composer_lock),
+}
+
+# Lockfiles: fijan el árbol completo de dependencias, incluidas las transitivas
+LOCKFILES = frozenset({
+    "Pipfile.lock", "poetry.lock", "package-lock.json", "npm-shrinkwrap.json",
+    "yarn.lock", "pnpm-lock.yaml", "Cargo.lock", "Gemfile.lock", "composer.lock"
+})
+
+# Ecosistemas con clave propia en las dependencias; el resto se agrupa en "other"
+DEPENDENCY_GROUPS = ("python", "node")
+
+def manifest_parser(filename: str) -> Optional[Tuple[str, Callable[[str], ParsedManifest]]]:
+    """
+    Devuelve el ecosistema y el parser de un manifiesto, o None si el archivo no lo es.
+    """
+    parser = MANIFEST_PARSERS.get(filename)
+    if parser is None and _REQUIREMENTS_FILE.match(filename):
+        return "python", _parse_requirements
+    return parser
+
+class ManifestResolver:
+    """
+    Localiza todos los manifiestos y lockfiles del índice (incluidos los
+    paquetes anidados de un monorepo), los descarga en paralelo y los parsea
+    con un parser específico por formato.
+
+    El resultado es la lista deduplicada de dependencias directas (python, node
+    y other), un grafo por ecosistema que asocia cada paquete (nombre declarado
+    o directorio) con las dependencias que declara su manifiesto, y las
+    dependencias transitivas: los paquetes fijados en lockfiles que ningún
+    manifiesto declara. Los lockfiles nunca añaden aristas al grafo. Si una
+    dependencia es otro paquete del repositorio, el grafo refleja la relación
+    entre ambos paquetes del workspace, pero no figura como dependencia directa
+    ni transitiva.
+    """
+
+    def __init__(self, concurrency: int = settings.PIPELINE_FETCH_CONCURRENCY):
+        self.concurrency = max(1, concurrency)
+
+    async def resolve(
+        self,
+        index: FileIndex,
+        fetch: Callable[[str], Awaitable[Optional[bytes]]]
+    ) -> Tuple[Dict[str, List[str]], Dict[str, Dict[str, List[str]]], Dict[str, List[str]]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(path: str, ecosystem: str, parser: Callable[[str], ParsedManifest]):
+            async with semaphore:
+                data = await fetch(path)
+            if not data:
+                return None
+            try:
+                name, dependencies = parser(data.decode("utf-8", errors="replace"))
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                print(f"Error parsing manifest {path}: {e}")
+                return None
+            return ecosystem, posixpath.dirname(path) or ".", name, dependencies, posixpath.basename(path) in LOCKFILES
+
+        manifests = []
+        for file in index.iter_named(lambda filename: manifest_parser(filename) is not None):
+            ecosystem, parser = manifest_parser(file.name)
+            manifests.append(load(file.path, ecosystem, parser))
+
+        # Agrupar los manifiestos por ecosistema y directorio; los lockfiles
+        # solo aportan paquetes fijados, nunca dependencias directas
+        packages: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        locked: Dict[str, set] = {}
+        for result in await asyncio.gather(*manifests):
+            if result is None:
+                continue
+            ecosystem, directory, name, dependencies, is_lockfile = result
+            if is_lockfile:
+                locked.setdefault(ecosystem, set()).update(dependency for dependency in dependencies if dependency)
+                continue
+            package = packages.setdefault((ecosystem, directory), {"name": None, "dependencies": set()})
+            package["name"] = package["name"] or name
+            package["dependencies"].update(dependency for dependency in dependencies if dependency)
+
+        graph: Dict[str, Dict[str, List[str]]] = {}
+        for (ecosystem, directory), package in sorted(packages.items()):
+            node = package["name"] or directory
+            edges = graph.setdefault(ecosystem, {}).setdefault(node, [])
+            edges.extend(package["dependencies"])
+
+        direct: Dict[str, set] = {}
+        for ecosystem, nodes in graph.items():
+            for node, edges in nodes.items():
+                nodes[node] = sorted(set(edges) - {node})
+                direct.setdefault(ecosystem, set()).update(nodes[node])
+            # Los paquetes del propio workspace son aristas del grafo, no dependencias
+            direct[ecosystem] = direct.get(ecosystem, set()) - set(nodes)
+
+        dependencies = self._group(direct)
+        transitive = self._group({
+            ecosystem: names - direct.get(ecosystem, set()) - set(graph.get(ecosystem, {}))
+            for ecosystem, names in locked.items()
+        })
+        return dependencies, graph, transitive
+
+    def _group(self, by_ecosystem: Dict[str, set]) -> Dict[str, List[str]]:
+        """
+        Agrupa las dependencias por ecosistema en las claves python, node y other.
+        """
+        grouped: Dict[str, set] = {group: set() for group in (*DEPENDENCY_GROUPS, "other")}
+        for ecosystem, names in by_ecosystem.items():
+            grouped[ecosystem if ecosystem in DEPENDENCY_GROUPS else "other"].update(names)
+        return {group: sorted(names) for group, names in grouped.items()}
@@ -0,0 +1,56 @@
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+class ModelRouter:
+    """
+    Selecciona el modelo para cada sección de la documentación a partir de
+    niveles configurables, ordenados del más rápido y barato al más capaz.
+
+    El nivel inicial lo fija el tamaño del prompt; el score de complejidad del
+    repositorio solo puede subirlo un nivel más. Solo se escala al siguiente
+    nivel cuando la respuesta no supera la validación.
+    """
+
+    def __init__(
+        self,
+        tiers: Optional[List[str]] = None,
+        token_thresholds: Optional[List[int]] = None,
+        complexity_thresholds: Optional[List[float]] = None,
+        section_min_tier: Optional[Dict[str, int]] = None
+    ):
+        self.tiers = list(tiers if tiers is not None else settings.OPENAI_MODEL_TIERS) or [settings.OPENAI_MODEL]
+        self.token_thresholds = sorted(
+            token_thresholds if token_thresholds is not None else settings.MODEL_ROUTING_TOKEN_THRESHOLDS
+        )
+        self.complexity_thresholds = sorted(
+            complexity_thresholds if complexity_thresholds is not None
+            else settings.MODEL_ROUTING_COMPLEXITY_THRESHOLDS
+        )
+        self.section_min_tier = dict(
+            section_min_tier if section_min_tier is not None else settings.MODEL_ROUTING_SECTION_MIN_TIER
+        )
+
+    @property
+    def max_tier(self) -> int:
+        return len(self.tiers) - 1
+
+    def select_tier(self, section: str, prompt_tokens: int, complexity_score: Optional[float] = None) -> int:
+        """
+        Devuelve el nivel inicial para una sección: el mayor entre el mínimo
+        configurado para la sección y el nivel por tamaño del prompt. La
+        complejidad sube ese nivel como mucho un paso, ya que el score se satura
+        en repositorios medianos y no debe anular el enrutado por tamaño.
+        """
+        token_tier = sum(1 for threshold in self.token_thresholds if prompt_tokens >= threshold)
+        complexity_tier = sum(
+            1 for threshold in self.complexity_thresholds if (complexity_score or 0.0) >= threshold
+        )
+        tier = max(
+            self.section_min_tier.get(section, 0),
+            token_tier,
+            min(complexity_tier, token_tier + 1)
+        )
+        return min(tier, self.max_tier)
+
+    def model_for(self, tier: int) -> str:
+        return self.tiers[min(max(tier, 0), self.max_tier)]
@@ -0,0 +1,253 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+
+# Tablas de clasificación precalculadas
+MAIN_FILES = frozenset({
+    "README.md", "requirements.txt", "package.json", "setup.py",
+    "pyproject.toml", "go.mod", "pom.xml", "build.gradle"
+})
+SOURCE_EXTENSIONS = frozenset({
+    ".py", ".js", ".ts", ".java", ".go", ".rb", ".php",
+    ".cpp", ".c", ".h", ".hpp", ".cs", ".swift"
+})
+CONFIG_FILES = frozenset({
+    ".env", ".env.example", "config.json", "config.yaml",
+    "config.yml", ".gitignore", ".dockerignore", "Dockerfile",
+    "docker-compose.yml", "docker-compose.yaml"
+})
+
+_NAME_CATEGORIES: Dict[str, str] = {
+    **{name: "config" for name in CONFIG_FILES},
+    **{name: "main" for name in MAIN_FILES},
+}
+_EXTENSION_CATEGORIES: Dict[str, str] = {extension: "source" for extension in SOURCE_EXTENSIONS}
+
+# Atributos de linguist que marcan rutas como código de terceros o generado
+_LINGUIST_ATTRIBUTES = ("linguist-vendored", "linguist-generated")
+
+class PathFilter:
+    """
+    Motor de filtrado de rutas con semántica de .gitignore.
+
+    Todas las reglas se compilan una sola vez en una expresión regular para
+    archivos y otra para directorios. Las alternativas se ordenan de la última
+    regla a la primera, de modo que la primera coincidencia es la regla que
+    gana según gitignore, incluidas las negaciones con "!". Un directorio
+    excluido se poda completo sin listar su contenido.
+
+    Las reglas de inclusión son rutas relativas a la raíz con comodines de
+    gitignore ("src/", "packages/*/lib", "**/*.md"). No filtran el índice,
+    que conserva manifiestos y archivos principales, sino los archivos que se
+    parsean; además se podan los directorios que no pueden contener ninguna
+    ruta incluida.
+    """
+
+    def __init__(self, exclude: Iterable[str] = (), include: Iterable[str] = ()):
+        rules = [rule for rule in (self._compile_rule(pattern) for pattern in exclude) if rule]
+        self._negated = [negated for _, negated, _ in rules]
+        self._file_matcher = self._combine(
+            (index, regex) for index, (regex, _, dir_only) in enumerate(rules) if not dir_only
+        )
+        self._dir_matcher = self._combine(
+            (index, regex) for index, (regex, _, _) in enumerate(rules)
+        )
+
+        include = [self._anchor(pattern) for pattern in include]
+        include_rules = [
+            rule for rule in (self._compile_rule(pattern) for pattern in include) if rule and not rule[1]
+        ]
+        self._include_matcher = self._combine(
+            (index, f"{regex}(?:/.*)?") for index, (regex, _, _) in enumerate(include_rules)
+        )
+        self._include_prefixes = [
+            segments for segments in (self._compile_prefix(pattern) for pattern in include) if segments
+        ]
+
+    @classmethod
+    def from_sources(
+        cls,
+        exclude: Optional[Iterable[str]] = None,
+        include: Optional[Iterable[str]] = None,
+        gitignore: Optional[str] = None,
+        gitattributes: Optional[str] = None
+    ) -> "PathFilter":
+        """
+        Combina, en orden de prioridad creciente, las reglas de `Settings`, el
+        .gitignore y el .gitattributes del repositorio y los overrides de la petición.
+        """
+        rules: List[str] = list(settings.PATH_EXCLUDE)
+        if gitignore:
+            rules.extend(gitignore.splitlines())
+        if gitattributes:
+            rules.extend(parse_gitattributes(gitattributes))
+        rules.extend(exclude or [])
+
+        return cls(exclude=rules, include=[*settings.PATH_INCLUDE, *(include or [])])
+
+    def is_excluded(self, path: str, is_dir: bool = False) -> bool:
+        matcher = self._dir_matcher if is_dir else self._file_matcher
+        if matcher is None:
+            return False
+        match = matcher.fullmatch(path)
+        return match is not None and not self._negated[int(match.lastgroup[1:])]
+
+    def allows(self, path: str, is_dir: bool = False) -> bool:
+        """
+        Indica si una ruta debe entrar en el índice. Los archivos solo se
+        descartan por reglas de exclusión; los directorios, además, si no
+        pueden contener ninguna ruta incluida.
+        """
+        if self.is_excluded(path, is_dir):
+            return False
+        return not is_dir or self._may_contain_included(path)
+
+    def includes(self, path: str) -> bool:
+        """
+        Indica si un archivo cumple las reglas de inclusión (o si no hay ninguna).
+        """
+        return self._include_matcher is None or self._include_matcher.fullmatch(path) is not None
+
+    @staticmethod
+    def classify(filename: str) -> Optional[str]:
+        """
+        Clasifica un archivo como "main", "source" o "config" mediante las
+        tablas precalculadas.
+        """
+        category = _NAME_CATEGORIES.get(filename)
+        if category is not None:
+            return category
+        dot = filename.rfind(".")
+        if dot <= 0:
+            return None
+        return _EXTENSION_CATEGORIES.get(filename[dot:])
+
+    def _may_contain_included(self, directory: str) -> bool:
+        """
+        Comprueba, segmento a segmento, si el directorio es prefijo de alguna
+        regla de inclusión o está dentro de una ruta incluida.
+        """
+        if self._include_matcher is None:
+            return True
+        parts = directory.split("/")
+        for segments in self._include_prefixes:
+            for position, part in enumerate(parts):
+                if position >= len(segments) or segments[position] is None:
+                    return True
+                if not segments[position].fullmatch(part):
+                    break
+            else:
+                return True
+        return False
+
+    def _anchor(self, pattern: str) -> str:
+        """
+        Ancla una regla de inclusión a la raíz del repositorio.
+        """
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#"):
+            return pattern
+        if pattern.startswith("!"):
+            return "!" + self._anchor(pattern[1:])
+        return "/" + pattern.lstrip("/")
+
+    def _compile_prefix(self, pattern: str) -> Optional[List[Optional["re.Pattern[str]"]]]:
+        """
+        Compila cada segmento de una regla de inclusión anclada. Un segmento con
+        "**" se representa con None: a partir de él cualquier directorio encaja.
+        """
+        pattern = pattern.strip("/")
+        if not pattern or pattern.startswith(("#", "!")):
+            return None
+        return [
+            None if "**" in segment else re.compile(self._translate(segment))
+            for segment in pattern.split("/")
+        ]
+
+    def _combine(self, rules: Iterable[Tuple[int, str]]) -> Optional["re.Pattern[str]"]:
+        alternatives = [f"(?P<r{index}>{regex})" for index, regex in rules]
+        if not alternatives:
+            return None
+        return re.compile("|".join(reversed(alternatives)))
+
+    def _compile_rule(self, pattern: str) -> Optional[Tuple[str, bool, bool]]:
+        """
+        Traduce un patrón de gitignore a (regex, negado, solo_directorios).
+        """
+        pattern = pattern.rstrip("\n").rstrip()
+        if not pattern or pattern.startswith("#"):
+            return None
+
+        negated = pattern.startswith("!")
+        if negated:
+            pattern = pattern[1:]
+        elif pattern.startswith("\\"):
+            pattern = pattern[1:]
+
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        if not pattern:
+            return None
+
+        regex = self._translate(pattern)
+        if not anchored:
+            regex = f"(?:.*/)?{regex}"
+        return regex, negated, dir_only
+
+    def _translate(self, pattern: str) -> str:
+        regex = []
+        i = 0
+        length = len(pattern)
+        while i < length:
+            char = pattern[i]
+            if pattern.startswith("**/", i):
+                regex.append("(?:.*/)?")
+                i += 3
+            elif pattern.startswith("/**", i) and i + 3 == length:
+                regex.append("(?:/.*)?")
+                i += 3
+            elif pattern.startswith("**", i):
+                regex.append(".*")
+                i += 2
+            elif char == "*":
+                regex.append("[^/]*")
+                i += 1
+            elif char == "?":
+                regex.append("[^/]")
+                i += 1
+            elif char == "[":
+                end = pattern.find("]", i + 2)
+                if end == -1:
+                    regex.append(re.escape(char))
+                    i += 1
+                    continue
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                regex.append(f"[{body}]")
+                i = end + 1
+            else:
+                regex.append(re.escape(char))
+                i += 1
+        return "".join(regex)
+
+def parse_gitattributes(content: str) -> List[str]:
+    """
+    Convierte las rutas marcadas como linguist-vendored o linguist-generated
+    en un .gitattributes en reglas de exclusión (y de inclusión si se desmarcan).
+    """
+    rules = []
+    for line in content.splitlines():
+        parts = line.split()
+        if not parts or parts[0].startswith("#"):
+            continue
+        pattern, attributes = parts[0], parts[1:]
+        for attribute in attributes:
+            name, _, value = attribute.lstrip("-!").partition("=")
+            if name not in _LINGUIST_ATTRIBUTES:
+                continue
+            unset = attribute.startswith(("-", "!")) or value.lower() == "false"
+            rules.append(f"!{pattern}" if unset else pattern)
+    return rules
@@ -1,11 +1,13 @@
 import httpx
-import base64
+import asyncio
 from typing import Dict, Any, List, Optional
-from pathlib import Path
 import re
-from app.domain.models import Repository, FileInfo, RepositoryStructure, RepositoryAnalysis
+from app.domain.models import Repository, RepositoryAnalysis
 from app.core.config import settings
 from app.core.exceptions import RepositoryError, RepositoryNotFoundError, RepositoryAccessError
+from app.infrastructure.path_filter import PathFilter
+from app.infrastructure.file_index import FileIndex
+from app.infrastructure.manifest_resolver import ManifestResolver
 
 class RepositoryAnalyzer:
     def __init__(self):
@@ -14,68 +16,187 @@ class RepositoryAnalyzer:
             "Accept": "application/vnd.github.v3+json",
             "Authorization": f"Bearer {settings.GITHUB_TOKEN}"
         }
+        self.manifest_resolver = ManifestResolver()
+        self._client: Optional[httpx.AsyncClient] = None
 
-    async def analyze_repository(self, repository: Repository) -> RepositoryAnalysis:
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Cliente HTTP compartido entre peticiones. Se crea en el primer uso para
+        no abrir conexiones al importar el módulo.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    async def warmup(self) -> None:
+        """
+        Abre el pool de conexiones con la API de GitHub. /rate_limit no consume
+        cuota, por lo que es la llamada más barata para establecer la conexión.
+        """
+        try:
+            response = await self.client.get(f"{self.github_api_url}/rate_limit", headers=self.headers)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"Error warming up GitHub client: {e}")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def analyze_repository(
+        self,
+        repository: Repository,
+        include_paths: Optional[List[str]] = None,
+        exclude_paths: Optional[List[str]] = None
+    ) -> RepositoryAnalysis:
         """
         Analiza un repositorio y devuelve información detallada sobre su estructura y contenido.
+        `include_paths` y `exclude_paths` son reglas con sintaxis de .gitignore
+        que se aplican sobre las de la configuración y las del propio repositorio.
         """
         if not settings.GITHUB_TOKEN:
             raise RepositoryError("GitHub token no configurado")
 
         if repository.type == "github":
-            return await self._analyze_github_repository(repository)
+            return await self._analyze_github_repository(repository, include_paths, exclude_paths)
         else:
             raise NotImplementedError(f"Análisis de repositorios {repository.type} no implementado")
 
-    async def _analyze_github_repository(self, repository: Repository) -> RepositoryAnalysis:
+    async def _analyze_github_repository(
+        self,
+        repository: Repository,
+        include_paths: Optional[List[str]] = None,
+        exclude_paths: Optional[List[str]] = None
+    ) -> RepositoryAnalysis:
         """
         Analiza un repositorio de GitHub.
         """
-        # Extraer owner y repo del URL
-        url_parts = str(repository.url).split("/")
+        owner, repo = self.get_owner_and_repo(repository)
+        client = self.client
+
+        try:
+            # Obtener información básica del repositorio
+            repo_info = await self._get_repo_info(client, owner, repo)
+            
+            # Obtener estructura del repositorio
+            index = await self._get_repository_structure(
+                client, owner, repo, repository.branch, include_paths, exclude_paths
+            )
+            statistics = index.statistics()
+            
+            # Analizar lenguajes
+            languages = await self._get_languages(client, owner, repo)
+            
+            # Analizar dependencias
+            dependencies, dependency_graph, transitive_dependencies = await self._analyze_dependencies(
+                client, owner, repo, repository.branch, index
+            )
+            
+            # Determinar tipo de proyecto y stack tecnológico
+            project_type, tech_stack = self._analyze_project_type(statistics, languages)
+            
+            # Calcular score de complejidad
+            complexity_score = self._calculate_complexity_score(statistics, languages)
+
+            analysis = RepositoryAnalysis(
+                languages=languages,
+                dependencies=dependencies,
+                dependency_graph=dependency_graph,
+                transitive_dependencies=transitive_dependencies,
+                main_tech_stack=tech_stack,
+                project_type=project_type,
+                complexity_score=complexity_score,
+                statistics=statistics
+            )
+            analysis.index = index
+            return analysis
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                raise RepositoryAccessError(f"Error de autenticación con GitHub: {e.response.text}")
+            elif e.response.status_code == 404:
+                raise RepositoryNotFoundError(f"Repositorio no encontrado: {repository.url}")
+            else:
+                raise RepositoryError(f"Error al acceder al repositorio: {e.response.text}")
+        except Exception as e:
+            raise RepositoryError(f"Error inesperado: {str(e)}")
+
+    async def resolve_commit_sha(self, repository: Repository) -> str:
+        """
+        Resuelve la rama del repositorio al SHA de su último commit con una
+        única llamada ligera a la API de GitHub.
+        """
+        if repository.type != "github":
+            raise NotImplementedError(f"Análisis de repositorios {repository.type} no implementado")
+
+        owner, repo = self.get_owner_and_repo(repository)
+        client = self.client
+
+        try:
+            response = await client.get(
+                f"{self.github_api_url}/repos/{owner}/{repo}/commits/{repository.branch}",
+                headers={**self.headers, "Accept": "application/vnd.github.sha"}
+            )
+            response.raise_for_status()
+            return response.text.strip()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                raise RepositoryAccessError(f"Error de autenticación con GitHub: {e.response.text}")
+            elif e.response.status_code in (404, 422):
+                raise RepositoryNotFoundError(f"Repositorio o rama no encontrados: {repository.url}")
+            else:
+                raise RepositoryError(f"Error al acceder al repositorio: {e.response.text}")
+        except httpx.HTTPError as e:
+            raise RepositoryError(f"Error inesperado: {str(e)}")
+
+    def get_owner_and_repo(self, repository: Repository) -> tuple[str, str]:
+        """Extrae owner y repo del URL del repositorio."""
+        url_parts = str(repository.url).rstrip("/").split("/")
         if len(url_parts) < 2:
             raise RepositoryError("URL de repositorio inválida")
-            
+
         owner = url_parts[-2]
         repo = url_parts[-1].replace(".git", "")
+        return owner, repo
 
-        async with httpx.AsyncClient() as client:
-            try:
-                # Obtener información básica del repositorio
-                repo_info = await self._get_repo_info(client, owner, repo)
-                
-                # Obtener estructura del repositorio
-                structure = await self._get_repository_structure(client, owner, repo, repository.branch)
-                
-                # Analizar lenguajes
-                languages = await self._get_languages(client, owner, repo)
-                
-                # Analizar dependencias
-                dependencies = await self._analyze_dependencies(structure)
-                
-                # Determinar tipo de proyecto y stack tecnológico
-                project_type, tech_stack = self._analyze_project_type(structure, languages)
-                
-                # Calcular score de complejidad
-                complexity_score = self._calculate_complexity_score(structure, languages)
-
-                return RepositoryAnalysis(
-                    structure=structure,
-                    languages=languages,
-                    dependencies=dependencies,
-                    main_tech_stack=tech_stack,
-                    project_type=project_type,
-                    complexity_score=complexity_score
-                )
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 401:
-                    raise RepositoryAccessError(f"Error de autenticación con GitHub: {e.response.text}")
-                elif e.response.status_code == 404:
-                    raise RepositoryNotFoundError(f"Repositorio no encontrado: {repository.url}")
-                else:
-                    raise RepositoryError(f"Error al acceder al repositorio: {e.response.text}")
-            except Exception as e:
-                raise RepositoryError(f"Error inesperado: {str(e)}")
+    async def fetch_file_bytes(
+        self,
+        client: httpx.AsyncClient,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: str,
+        max_size: int = settings.MAX_FILE_SIZE
+    ) -> Optional[bytes]:
+        """
+        Descarga el contenido crudo de un archivo en streaming.
+
+        Devuelve None si el archivo no se puede descargar o si supera `max_size`,
+        abortando la descarga en cuanto se excede el límite.
+        """
+        headers = {**self.headers, "Accept": "application/vnd.github.raw"}
+        try:
+            async with client.stream(
+                "GET",
+                f"{self.github_api_url}/repos/{owner}/{repo}/contents/{path}",
+                headers=headers,
+                params={"ref": ref}
+            ) as response:
+                response.raise_for_status()
+                declared_size = response.headers.get("Content-Length")
+                if declared_size and int(declared_size) > max_size:
+                    return None
+
+                chunks = bytearray()
+                async for chunk in response.aiter_bytes():
+                    chunks.extend(chunk)
+                    if len(chunks) > max_size:
+                        return None
+                return bytes(chunks)
+        except httpx.HTTPError as e:
+            print(f"Error getting file content: {e}")
+        return None
 
     async def _get_repo_info(self, client: httpx.AsyncClient, owner: str, repo: str) -> Dict[str, Any]:
         """Obtiene información básica del repositorio."""
@@ -91,54 +212,77 @@ class RepositoryAnalyzer:
         client: httpx.AsyncClient, 
         owner: str, 
         repo: str, 
-        branch: str
-    ) -> RepositoryStructure:
-        """Obtiene la estructura completa del repositorio."""
-        files: List[FileInfo] = []
-        directories: List[FileInfo] = []
-        main_files: List[FileInfo] = []
-        source_files: List[FileInfo] = []
-        config_files: List[FileInfo] = []
-
-        async def process_directory(path: str = ""):
+        branch: str,
+        include_paths: Optional[List[str]] = None,
+        exclude_paths: Optional[List[str]] = None
+    ) -> FileIndex:
+        """
+        Obtiene la estructura completa del repositorio como un índice columnar.
+        Los directorios excluidos, o que no pueden contener rutas incluidas, se
+        podan sin listar su contenido.
+        """
+        index = FileIndex()
+
+        async def list_directory(path: str = "") -> List[Dict[str, Any]]:
             response = await client.get(
                 f"{self.github_api_url}/repos/{owner}/{repo}/contents/{path}",
                 headers=self.headers,
                 params={"ref": branch}
             )
             response.raise_for_status()
-            items = response.json()
+            return response.json()
 
+        async def process_directory(items: List[Dict[str, Any]]):
             for item in items:
-                file_info = FileInfo(
-                    name=item["name"],
-                    path=item["path"],
-                    type=item["type"],
-                    size=item.get("size"),
-                    extension=Path(item["name"]).suffix
-                )
-
-                if item["type"] == "dir":
-                    directories.append(file_info)
-                    await process_directory(item["path"])
+                is_dir = item["type"] == "dir"
+                if not path_filter.allows(item["path"], is_dir):
+                    continue
+
+                if is_dir:
+                    index.add_directory(item["path"])
+                    await process_directory(await list_directory(item["path"]))
                 else:
-                    files.append(file_info)
-                    
-                    # Clasificar archivos
-                    if self._is_main_file(item["name"]):
-                        main_files.append(file_info)
-                    elif self._is_source_file(item["name"]):
-                        source_files.append(file_info)
-                    elif self._is_config_file(item["name"]):
-                        config_files.append(file_info)
-
-        await process_directory()
-        return RepositoryStructure(
-            files=files,
-            directories=directories,
-            main_files=main_files,
-            source_files=source_files,
-            config_files=config_files
+                    index.add_file(
+                        item["path"], item.get("size"), item.get("sha"), path_filter.includes(item["path"])
+                    )
+
+        root_items = await list_directory()
+        path_filter = await self._build_path_filter(
+            client, owner, repo, branch, root_items, include_paths, exclude_paths
+        )
+        await process_directory(root_items)
+        return index
+
+    async def _build_path_filter(
+        self,
+        client: httpx.AsyncClient,
+        owner: str,
+        repo: str,
+        branch: str,
+        root_items: List[Dict[str, Any]],
+        include_paths: Optional[List[str]],
+        exclude_paths: Optional[List[str]]
+    ) -> PathFilter:
+        """
+        Compila el filtro de rutas combinando la configuración, el .gitignore y
+        el .gitattributes de la raíz del repositorio y los overrides de la petición.
+        """
+        root_files = {item["name"] for item in root_items if item["type"] == "file"}
+
+        async def read_root_file(name: str) -> Optional[str]:
+            if name not in root_files:
+                return None
+            data = await self.fetch_file_bytes(client, owner, repo, name, branch)
+            return data.decode("utf-8", errors="replace") if data else None
+
+        gitignore, gitattributes = await asyncio.gather(
+            read_root_file(".gitignore"), read_root_file(".gitattributes")
+        )
+        return PathFilter.from_sources(
+            exclude=exclude_paths,
+            include=include_paths,
+            gitignore=gitignore,
+            gitattributes=gitattributes
         )
 
     async def _get_languages(self, client: httpx.AsyncClient, owner: str, repo: str) -> Dict[str, int]:
@@ -150,29 +294,24 @@ class RepositoryAnalyzer:
         response.raise_for_status()
         return response.json()
 
-    async def _analyze_dependencies(self, structure: RepositoryStructure) -> Dict[str, List[str]]:
-        """Analiza las dependencias del proyecto."""
-        dependencies = {
-            "python": [],
-            "node": [],
-            "other": []
-        }
+    async def _analyze_dependencies(
+        self,
+        client: httpx.AsyncClient,
+        owner: str,
+        repo: str,
+        branch: str,
+        index: FileIndex
+    ) -> tuple[Dict[str, List[str]], Dict[str, Dict[str, List[str]]], Dict[str, List[str]]]:
+        """Analiza las dependencias de todos los manifiestos del proyecto."""
 
-        for file in structure.main_files:
-            if file.name == "requirements.txt":
-                content = await self._get_file_content(file.path)
-                if content:
-                    dependencies["python"] = self._parse_requirements(content)
-            elif file.name == "package.json":
-                content = await self._get_file_content(file.path)
-                if content:
-                    dependencies["node"] = self._parse_package_json(content)
+        async def fetch(path: str) -> Optional[bytes]:
+            return await self.fetch_file_bytes(client, owner, repo, path, branch, settings.MANIFEST_MAX_SIZE)
 
-        return dependencies
+        return await self.manifest_resolver.resolve(index, fetch)
 
     def _analyze_project_type(
         self, 
-        structure: RepositoryStructure, 
+        statistics: Dict[str, Any], 
         languages: Dict[str, int]
     ) -> tuple[Optional[str], List[str]]:
         """Determina el tipo de proyecto y su stack tecnológico."""
@@ -184,102 +323,38 @@ class RepositoryAnalyzer:
         tech_stack.extend([lang for lang, _ in main_languages])
 
         # Determinar tipo de proyecto
-        if any(file.name == "package.json" for file in structure.main_files):
-            project_type = "web" if any(file.name.endswith(".html") for file in structure.files) else "node"
-        elif any(file.name == "requirements.txt" for file in structure.main_files):
-            if any(file.name.endswith(".py") for file in structure.files):
+        main_files = set(statistics["main_files"])
+        extensions = statistics["files_by_extension"]
+        if "package.json" in main_files:
+            project_type = "web" if ".html" in extensions else "node"
+        elif "requirements.txt" in main_files:
+            if ".py" in extensions:
                 project_type = "python"
-        elif any(file.name.endswith(".java") for file in structure.files):
+        elif ".java" in extensions:
             project_type = "java"
-        elif any(file.name.endswith(".go") for file in structure.files):
+        elif ".go" in extensions:
             project_type = "go"
 
         return project_type, tech_stack
 
     def _calculate_complexity_score(
         self, 
-        structure: RepositoryStructure, 
+        statistics: Dict[str, Any], 
         languages: Dict[str, int]
     ) -> float:
         """Calcula un score de complejidad del proyecto."""
         score = 0.0
         
         # Factor 1: Cantidad de archivos
-        score += len(structure.files) * 0.1
+        score += statistics["file_count"] * 0.1
         
         # Factor 2: Cantidad de lenguajes
         score += len(languages) * 0.2
         
         # Factor 3: Profundidad de directorios
-        max_depth = max(len(Path(file.path).parts) for file in structure.files)
-        score += max_depth * 0.15
+        score += statistics["max_depth"] * 0.15
         
         # Factor 4: Cantidad de archivos de configuración
-        score += len(structure.config_files) * 0.1
+        score += statistics["config_file_count"] * 0.1
         
         return min(score, 10.0)  # Normalizar a un máximo de 10
-
-    def _is_main_file(self, filename: str) -> bool:
-        """Determina si un archivo es un archivo principal del proyecto."""
-        main_files = {
-            "README.md", "requirements.txt", "package.json", "setup.py",
-            "pyproject.toml", "go.mod", "pom.xml", "build.gradle"
-        }
-        return filename in main_files
-
-    def _is_source_file(self, filename: str) -> bool:
-        """Determina si un archivo es un archivo de código fuente."""
-        source_extensions = {
-            ".py", ".js", ".ts", ".java", ".go", ".rb", ".php",
-            ".cpp", ".c", ".h", ".hpp", ".cs", ".swift"
-        }
-        return Path(filename).suffix in source_extensions
-
-    def _is_config_file(self, filename: str) -> bool:
-        """Determina si un archivo es un archivo de configuración."""
-        config_files = {
-            ".env", ".env.example", "config.json", "config.yaml",
-            "config.yml", ".gitignore", ".dockerignore", "Dockerfile",
-            "docker-compose.yml", "docker-compose.yaml"
-        }
-        return filename in config_files
-
-    async def _get_file_content(self, path: str) -> Optional[str]:
-        """Obtiene el contenido de un archivo del repositorio."""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.github_api_url}/repos/{path}",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                content = response.json().get("content", "")
-                if content:
-                    return base64.b64decode(content).decode("utf-8")
-        except Exception as e:
-            print(f"Error getting file content: {e}")
-        return None
-
-    def _parse_requirements(self, content: str) -> List[str]:
-        """Parsea un archivo requirements.txt."""
-        requirements = []
-        for line in content.split("\n"):
-            line = line.strip()
-            if line and not line.startswith("#"):
-                requirements.append(line.split("==")[0])
-        return requirements
-
-    def _parse_package_json(self, content: str) -> List[str]:
-        """Parsea un archivo package.json."""
-        try:
-            import json
-            data = json.loads(content)
-            dependencies = []
-            if "dependencies" in data:
-                dependencies.extend(data["dependencies"].keys())
-            if "devDependencies" in data:
-                dependencies.extend(data["devDependencies"].keys())
-            return dependencies
-        except Exception as e:
-            print(f"Error parsing package.json: {e}")
-            return [] 
\ No newline at end of file
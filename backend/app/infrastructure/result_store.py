@@ -0,0 +1,162 @@
+import json
+import time
+import zlib
+import asyncio
+import sqlite3
+import threading
+import importlib
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional
+from app.core.config import settings
+
+class ResultStore(ABC):
+    """
+    Interfaz de almacenamiento persistente de resultados. Los valores son
+    diccionarios serializables a JSON identificados por una clave que incluye
+    el SHA del commit, por lo que nunca quedan desactualizados.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def put(self, key: str, value: Dict[str, Any]) -> None:
+        ...
+
+    async def warmup(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+class SQLiteResultStore(ResultStore):
+    """
+    Almacén por defecto sobre SQLite. Guarda los resultados como blobs JSON
+    comprimidos con zlib y aplica desalojo por antigüedad y por tamaño total,
+    eliminando primero las entradas usadas hace más tiempo.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.RESULT_STORE_PATH,
+        max_bytes: int = settings.RESULT_STORE_MAX_BYTES,
+        max_age: int = settings.RESULT_STORE_MAX_AGE
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, value: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self._put, key, value)
+
+    async def warmup(self) -> None:
+        """Abre la conexión y crea el esquema antes de la primera petición."""
+        await asyncio.to_thread(self._warmup)
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_results_accessed_at ON results (accessed_at)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _warmup(self) -> None:
+        with self._lock:
+            self._connect()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT data, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            data, created_at = row
+            if now - created_at > self.max_age:
+                connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                connection.commit()
+                return None
+
+            connection.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            connection.commit()
+
+        return json.loads(zlib.decompress(data))
+
+    def _put(self, key: str, value: Dict[str, Any]) -> None:
+        # Serializar y comprimir fuera del event loop
+        data = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, data, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now)
+            )
+            self._evict(connection, now)
+            connection.commit()
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        """
+        Elimina las entradas caducadas y, si el tamaño total supera el
+        límite, las menos usadas recientemente hasta volver a estar por debajo.
+        """
+        connection.execute("DELETE FROM results WHERE created_at < ?", (now - self.max_age,))
+
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+def create_result_store() -> Optional[ResultStore]:
+    """
+    Crea el almacén configurado en RESULT_STORE_BACKEND: "sqlite", "none" para
+    desactivarlo, o una ruta "modulo:Clase" a una implementación de ResultStore.
+    """
+    backend = settings.RESULT_STORE_BACKEND.strip()
+    if not backend or backend.lower() == "none":
+        return None
+    if backend.lower() == "sqlite":
+        return SQLiteResultStore()
+
+    module_name, _, class_name = backend.partition(":")
+    store_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(store_class, type) and issubclass(store_class, ResultStore)):
+        raise TypeError(f"RESULT_STORE_BACKEND debe apuntar a una subclase de ResultStore: {backend}")
+    return store_class()
@@ -1,14 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
 from app.core.config import settings
 from app.core.middleware import RateLimitMiddleware, ErrorHandlerMiddleware
+from app.services.documentation_service import DocumentationService
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Los clientes se crean aquí y no al importar los módulos
+    app.state.documentation_service = DocumentationService()
+    if settings.WARMUP_ON_STARTUP:
+        # El worker no se reporta listo hasta que termina el lifespan de arranque
+        await app.state.documentation_service.warmup()
+    yield
+    await app.state.documentation_service.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="API para generación automática de documentación técnica usando IA",
     version=settings.VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # Middleware
@@ -1,30 +1,111 @@
+import asyncio
+import json
+from typing import Dict, Any, Optional
 from app.domain.models import DocumentationRequest, DocumentationResponse, RepositoryAnalysis
 from app.infrastructure.repository_analyzer import RepositoryAnalyzer
 from app.infrastructure.ai_service import AIService
 from app.infrastructure.code_parser import CodeParser
+from app.infrastructure.file_pipeline import FilePipeline
+from app.infrastructure.result_store import ResultStore, create_result_store
 
 class DocumentationService:
-    def __init__(self):
+    def __init__(self, result_store: Optional[ResultStore] = None):
         self.repository_analyzer = RepositoryAnalyzer()
         self.ai_service = AIService()
         self.code_parser = CodeParser()
+        self.file_pipeline = FilePipeline(self.repository_analyzer, self.code_parser)
+        self.result_store = result_store if result_store is not None else create_result_store()
+
+    async def warmup(self) -> None:
+        """
+        Abre los pools de conexiones y prepara el almacén de resultados antes
+        de que el worker empiece a aceptar peticiones.
+        """
+        tasks = [self.repository_analyzer.warmup(), self.ai_service.warmup()]
+        if self.result_store is not None:
+            tasks.append(self.result_store.warmup())
+        await asyncio.gather(*tasks)
+
+    async def close(self) -> None:
+        await self.repository_analyzer.aclose()
+        await self.ai_service.aclose()
+        if self.result_store is not None:
+            await self.result_store.close()
 
     async def generate_documentation(self, request: DocumentationRequest) -> DocumentationResponse:
         """
         Genera documentación para un repositorio.
         """
+        # Fijar la rama a un commit: el resultado para un SHA nunca cambia
+        commit_sha = await self.repository_analyzer.resolve_commit_sha(request.repository)
+        repository = request.repository.model_copy(update={"branch": commit_sha})
+        store_key = self._store_key(request, commit_sha)
+
+        stored = await self._load_result(store_key)
+        if stored is not None:
+            response = DocumentationResponse(**stored["documentation"])
+            response.metadata = {**(response.metadata or {}), "commit_sha": commit_sha, "cached": True}
+            return response
+
         # Analizar el repositorio
-        repo_analysis = await self.repository_analyzer.analyze_repository(request.repository)
+        repo_analysis = await self.repository_analyzer.analyze_repository(
+            repository, request.include_paths, request.exclude_paths
+        )
         
-        # Parsear el código
-        parsed_code = self.code_parser.parse_code(repo_analysis)
+        # Descargar y parsear el código en streaming, sin retener el contenido
+        parsed_code = await self.code_parser.collect(
+            self.file_pipeline.run(repository, repo_analysis.index.iter_included())
+        )
         
         # Generar documentación usando IA
-        documentation = await self.ai_service.generate_documentation(parsed_code, request)
+        documentation = await self.ai_service.generate_documentation(parsed_code, request, repo_analysis)
         
-        return DocumentationResponse(
+        response = DocumentationResponse(
             readme=documentation.get("readme"),
             comments=documentation.get("comments"),
             architecture=documentation.get("architecture"),
-            checklist=documentation.get("checklist")
-        ) 
\ No newline at end of file
+            checklist=documentation.get("checklist"),
+            metadata={**documentation.get("metadata", {}), "commit_sha": commit_sha}
+        )
+
+        await self._save_result(store_key, repo_analysis, parsed_code, response)
+
+        response.metadata["cached"] = False
+        return response
+
+    def _store_key(self, request: DocumentationRequest, commit_sha: str) -> str:
+        """
+        Clave del resultado: repositorio, SHA del commit y secciones solicitadas.
+        """
+        owner, repo = self.repository_analyzer.get_owner_and_repo(request.repository)
+        options = json.dumps(request.model_dump(mode="json", exclude={"repository"}), sort_keys=True)
+        return f"{request.repository.type.value}:{owner}/{repo}@{commit_sha}:{options}"
+
+    async def _load_result(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.result_store is None:
+            return None
+        try:
+            return await self.result_store.get(key)
+        except Exception as e:
+            print(f"Error reading stored result: {e}")
+            return None
+
+    async def _save_result(
+        self,
+        key: str,
+        analysis: RepositoryAnalysis,
+        parsed_code: Dict[str, Any],
+        response: DocumentationResponse
+    ) -> None:
+        if self.result_store is None:
+            return
+        try:
+            await self.result_store.put(key, {
+                "analysis": analysis.model_dump(mode="json"),
+                # El árbol de archivos se guarda en el formato columnar del índice
+                "index": analysis.index.to_dict() if analysis.index is not None else None,
+                "parsed_code": parsed_code,
+                "documentation": response.model_dump(mode="json")
+            })
+        except Exception as e:
+            print(f"Error storing result: {e}")
@@ -0,0 +1,5 @@
+import os
+
+# La configuración exige credenciales al importarse; los tests no llaman a las APIs
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("GITHUB_TOKEN", "test")
@@ -0,0 +1,40 @@
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+from app.infrastructure.ai_service import AIService
+from app.infrastructure.code_parser import CodeParser
+
+SOURCE = '''
+class A:
+    """Clase A."""
+    def __init__(self):
+        self.a = 1
+
+class B:
+    """Clase B."""
+    def __init__(self):
+        self.b = 2
+'''
+
+class _ReversedCompletions:
+    """Responde con un docstring por id, en orden inverso al del prompt."""
+
+    async def create(self, model, messages):
+        ids = re.findall(r"^\s*# id: (.+)$", messages[0]["content"], re.MULTILINE)
+        docstrings = [{"id": symbol_id, "docstring": f"Doc {symbol_id}"} for symbol_id in reversed(ids)]
+        content = json.dumps({"docstrings": docstrings})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def test_same_named_methods_get_their_own_docstring():
+    parsed = {"files": [CodeParser().parse_file("m.py", "m.py", SOURCE)]}
+    service = AIService()
+    service._client = SimpleNamespace(chat=SimpleNamespace(completions=_ReversedCompletions()))
+
+    comments = asyncio.run(service._generate_comments(parsed))
+
+    assert sorted(comment["symbol"] for comment in comments) == ["A.__init__", "B.__init__"]
+    for comment in comments:
+        assert comment["docstring"] == f"Doc {comment['id']}"
+        assert comment["id"] == f"m.py:{comment['symbol']}@{comment['lineno']}"
@@ -0,0 +1,42 @@
+import json
+
+from app.infrastructure.file_index import FileIndex
+
+FILES = [
+    ("README.md", 120, "a" * 40, True),
+    ("setup.py", 900, "b" * 40, False),
+    ("src/app/main.py", 4000, None, True),
+    ("src/app/util.py", 250000, "c" * 40, True),
+    ("docs/guide.md", 2048, "d" * 40, False),
+]
+
+def _index() -> FileIndex:
+    index = FileIndex()
+    for path, size, sha, included in FILES:
+        index.add_file(path, size, sha, included)
+    return index
+
+def test_statistics_are_computed_from_columns():
+    statistics = _index().statistics()
+
+    assert statistics["file_count"] == 5
+    assert statistics["directory_count"] == 2
+    assert statistics["max_depth"] == 3
+    assert statistics["total_bytes"] == sum(size for _, size, _, _ in FILES)
+    assert statistics["files_by_extension"] == {".md": 2, ".py": 3}
+    assert statistics["main_files"] == ["README.md", "setup.py"]
+    assert statistics["size_histogram_by_directory"]["src"] == {
+        "<1KB": 0, "<10KB": 1, "<100KB": 0, "<1MB": 1, ">=1MB": 0
+    }
+
+def test_round_trip_preserves_files_and_statistics():
+    index = _index()
+    restored = FileIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+
+    assert list(restored.iter_files()) == list(index.iter_files())
+    assert [file.path for file in restored.iter_included()] == ["README.md", "src/app/main.py", "src/app/util.py"]
+    assert restored.statistics() == index.statistics()
+
+    # El índice restaurado sigue admitiendo altas sin duplicar tablas internadas
+    restored.add_file("src/app/extra.py", 10)
+    assert len(restored.directories) == len(index.directories)
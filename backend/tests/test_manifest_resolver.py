@@ -0,0 +1,157 @@
+import asyncio
+import json
+
+import pytest
+
+from app.infrastructure.file_index import FileIndex
+from app.infrastructure.manifest_resolver import ManifestResolver, manifest_parser
+
+GO_MOD = """module github.com/acme/api
+
+go 1.21
+
+require github.com/single/dep v1.2.3
+
+require (
+\tgithub.com/gin-gonic/gin v1.9.1
+\tgolang.org/x/sys v0.15.0 // indirect
+)
+
+require github.com/other/indirect v0.1.0 // indirect
+"""
+
+PNPM_V6 = """lockfileVersion: '6.0'
+
+dependencies:
+  lodash:
+    specifier: ^4.17.21
+    version: 4.17.21
+
+packages:
+
+  /lodash@4.17.21:
+    resolution: {integrity: sha512-x}
+    dev: false
+
+  /@babel/core@7.23.0:
+    resolution: {integrity: sha512-y}
+    dependencies:
+      debug: 4.3.4
+"""
+
+PNPM_V9 = """lockfileVersion: '9.0'
+
+importers:
+
+  .:
+    dependencies:
+      lodash:
+        specifier: ^4.17.21
+        version: 4.17.21
+
+packages:
+
+  '@babel/core@7.23.0':
+    resolution: {integrity: sha512-y}
+
+  lodash@4.17.21:
+    resolution: {integrity: sha512-x}
+
+snapshots:
+
+  lodash@4.17.21: {}
+"""
+
+PACKAGE_LOCK_V1 = json.dumps({
+    "lockfileVersion": 1,
+    "dependencies": {
+        "lodash": {"version": "4.17.21"},
+        "react": {"version": "18.2.0", "requires": {"loose-envify": "^1.1.0"}},
+        "loose-envify": {"version": "1.4.0"},
+    },
+})
+
+PACKAGE_LOCK_V3 = json.dumps({
+    "lockfileVersion": 3,
+    "packages": {
+        "": {"name": "root", "dependencies": {"lodash": "^4"}},
+        "node_modules/lodash": {"version": "4.17.21"},
+        "node_modules/@types/node": {"version": "20.0.0"},
+        "node_modules/a/node_modules/b": {"version": "1.0.0"},
+        "packages/web": {"name": "web"},
+    },
+})
+
+POM = """<project>
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+  </parent>
+  <artifactId>billing</artifactId>
+  <dependencies>
+    <dependency>
+      <groupId>org.springframework.boot</groupId>
+      <artifactId>spring-boot-starter-web</artifactId>
+    </dependency>
+    <dependency>
+      <groupId>junit</groupId>
+      <artifactId>junit</artifactId>
+    </dependency>
+  </dependencies>
+  <build>
+    <plugins><plugin><groupId>org.apache</groupId><artifactId>maven-plugin</artifactId></plugin></plugins>
+  </build>
+</project>
+"""
+
+def _parse(filename: str, content: str):
+    _, parser = manifest_parser(filename)
+    name, dependencies = parser(content)
+    return name, sorted(dependencies)
+
+@pytest.mark.parametrize("filename, content, expected", [
+    ("go.mod", GO_MOD, ("github.com/acme/api", ["github.com/gin-gonic/gin", "github.com/single/dep"])),
+    ("pnpm-lock.yaml", PNPM_V6, (None, ["@babel/core", "lodash"])),
+    ("pnpm-lock.yaml", PNPM_V9, (None, ["@babel/core", "lodash"])),
+    ("package-lock.json", PACKAGE_LOCK_V1, (None, ["lodash", "loose-envify", "react"])),
+    ("package-lock.json", PACKAGE_LOCK_V3, (None, ["@types/node", "b", "lodash"])),
+    ("pom.xml", POM, ("billing", ["junit:junit", "org.springframework.boot:spring-boot-starter-web"])),
+    ("requirements-dev.txt", "Django>=4 # web\n-r base.txt\nzope.interface\n", (None, ["django", "zope-interface"])),
+])
+def test_manifest_parsers(filename, content, expected):
+    assert _parse(filename, content) == expected
+
+def _resolve(files):
+    index = FileIndex()
+    for path in files:
+        index.add_file(path, len(files[path]))
+
+    async def fetch(path):
+        return files[path].encode("utf-8")
+
+    return asyncio.run(ManifestResolver().resolve(index, fetch))
+
+def test_lockfiles_do_not_add_graph_edges():
+    dependencies, graph, transitive = _resolve({
+        "package.json": json.dumps({"name": "root", "dependencies": {"lodash": "^4"}}),
+        "package-lock.json": PACKAGE_LOCK_V1,
+    })
+
+    assert graph["node"] == {"root": ["lodash"]}
+    assert dependencies["node"] == ["lodash"]
+    assert transitive["node"] == ["loose-envify", "react"]
+
+def test_workspace_packages_are_not_external_dependencies():
+    dependencies, graph, transitive = _resolve({
+        "packages/a/package.json": json.dumps({"name": "@x/a", "dependencies": {"@x/b": "*", "react": "^18"}}),
+        "packages/b/package.json": json.dumps({"name": "@x/b", "dependencies": {"lodash": "^4"}}),
+        "go.mod": GO_MOD,
+    })
+
+    assert graph["node"] == {"@x/a": ["@x/b", "react"], "@x/b": ["lodash"]}
+    assert dependencies == {
+        "python": [],
+        "node": ["lodash", "react"],
+        "other": ["github.com/gin-gonic/gin", "github.com/single/dep"],
+    }
+    assert transitive == {"python": [], "node": [], "other": []}
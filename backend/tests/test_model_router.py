@@ -0,0 +1,37 @@
+from app.infrastructure.model_router import ModelRouter
+from app.infrastructure.repository_analyzer import RepositoryAnalyzer
+
+TIERS = ["small", "medium", "large"]
+
+def _router() -> ModelRouter:
+    return ModelRouter(
+        tiers=TIERS,
+        token_thresholds=[6000, 24000],
+        complexity_thresholds=[5.0, 9.0],
+        section_min_tier={}
+    )
+
+def _complexity(file_count: int, max_depth: int, config_file_count: int, languages: int) -> float:
+    statistics = {"file_count": file_count, "max_depth": max_depth, "config_file_count": config_file_count}
+    return RepositoryAnalyzer()._calculate_complexity_score(statistics, {f"lang{i}": 1 for i in range(languages)})
+
+def test_small_repository_routes_by_prompt_size():
+    router = _router()
+    score = _complexity(file_count=12, max_depth=2, config_file_count=2, languages=1)
+
+    assert router.model_for(router.select_tier("checklist", 500, score)) == "small"
+    assert router.model_for(router.select_tier("readme", 8000, score)) == "medium"
+    assert router.model_for(router.select_tier("readme", 30000, score)) == "large"
+
+def test_medium_repository_raises_tier_by_at_most_one_step():
+    router = _router()
+    score = _complexity(file_count=300, max_depth=6, config_file_count=8, languages=3)
+    assert score == 10.0
+
+    assert router.model_for(router.select_tier("checklist", 500, score)) == "medium"
+    assert router.model_for(router.select_tier("comments", 3000, score)) == "medium"
+    assert router.model_for(router.select_tier("readme", 8000, score)) == "large"
+
+def test_section_minimum_tier_still_applies():
+    router = ModelRouter(tiers=TIERS, token_thresholds=[6000], complexity_thresholds=[], section_min_tier={"readme": 2})
+    assert router.model_for(router.select_tier("readme", 100, None)) == "large"
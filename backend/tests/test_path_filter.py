@@ -0,0 +1,120 @@
+import pytest
+
+from app.infrastructure.path_filter import PathFilter, parse_gitattributes
+
+EXCLUDE = [
+    "*.log",
+    "!important.log",
+    "/build",
+    "docs/**/*.md",
+    "!docs/keep.md",
+    "gen/",
+    "a/**/b",
+    "[ab]c.txt",
+    "\\!bang",
+]
+
+@pytest.mark.parametrize("path, is_dir, excluded", [
+    # Sin "/" la regla se aplica a cualquier profundidad
+    ("x.log", False, True),
+    ("deep/nested/x.log", False, True),
+    # Una negación posterior rescata la ruta
+    ("important.log", False, False),
+    ("deep/important.log", False, False),
+    # "/" inicial ancla la regla a la raíz
+    ("build", True, True),
+    ("build", False, True),
+    ("src/build", True, False),
+    # "**/" encaja con cero o más directorios
+    ("docs/a/b/c.md", False, True),
+    ("docs/c.md", False, True),
+    ("docs/keep.md", False, False),
+    ("other/docs/c.md", False, False),
+    ("a/b", False, True),
+    ("a/x/y/b", False, True),
+    # "/" final solo excluye directorios
+    ("gen", True, True),
+    ("src/gen", True, True),
+    ("gen", False, False),
+    # Clases de caracteres y escapes
+    ("ac.txt", False, True),
+    ("cc.txt", False, False),
+    ("!bang", False, True),
+    ("main.py", False, False),
+])
+def test_gitignore_rules(path, is_dir, excluded):
+    assert PathFilter(exclude=EXCLUDE).is_excluded(path, is_dir) is excluded
+
+@pytest.mark.parametrize("rules, path, excluded", [
+    (["*.txt", "!keep.txt"], "keep.txt", False),
+    (["!keep.txt", "*.txt"], "keep.txt", True),
+    (["tmp/", "!tmp/"], "tmp", False),
+])
+def test_last_matching_rule_wins(rules, path, excluded):
+    assert PathFilter(exclude=rules).is_excluded(path, is_dir=True) is excluded
+
+@pytest.mark.parametrize("content, rules", [
+    ("third_party/** linguist-vendored", ["third_party/**"]),
+    ("*.pb.go linguist-generated=true", ["*.pb.go"]),
+    ("lib/x.js -linguist-vendored", ["!lib/x.js"]),
+    ("lib/y.js !linguist-generated", ["!lib/y.js"]),
+    ("*.js linguist-generated=false", ["!*.js"]),
+    ("*.txt text eol=lf", []),
+    ("# vendor/** linguist-vendored", []),
+])
+def test_parse_gitattributes(content, rules):
+    assert parse_gitattributes(content) == rules
+
+def test_gitattributes_unset_overrides_vendored_directory():
+    rules = parse_gitattributes("vendor/** linguist-vendored\nvendor/keep.js -linguist-vendored")
+    path_filter = PathFilter(exclude=rules)
+    assert path_filter.is_excluded("vendor/lib.js")
+    assert not path_filter.is_excluded("vendor/keep.js")
+
+@pytest.mark.parametrize("path, included", [
+    ("src/a.py", True),
+    ("src/deep/a.py", True),
+    ("lib/src/a.py", False),
+    ("packages/p1/lib/c.ts", True),
+    ("packages/p1/test/t.ts", False),
+    ("docs/guide.md", True),
+    ("README.md", True),
+    ("setup.py", False),
+])
+def test_include_rules_are_anchored_to_root(path, included):
+    path_filter = PathFilter(include=["src/", "packages/*/lib", "**/*.md"])
+    assert path_filter.includes(path) is included
+
+@pytest.mark.parametrize("directory, listed", [
+    ("src", True),
+    ("src/deep/er", True),
+    ("docs", False),
+    ("packages", True),
+    ("packages/p1", True),
+    ("packages/p1/lib/x", True),
+    ("packages/p1/test", False),
+    ("node_modules", False),
+])
+def test_directories_outside_include_rules_are_pruned(directory, listed):
+    path_filter = PathFilter(exclude=["node_modules/"], include=["src/", "packages/*/lib"])
+    assert path_filter.allows(directory, is_dir=True) is listed
+
+def test_include_rules_do_not_drop_files_from_index():
+    path_filter = PathFilter(include=["src/"])
+    assert path_filter.allows("requirements.txt")
+    assert not path_filter.includes("requirements.txt")
+
+def test_recursive_include_disables_pruning():
+    assert PathFilter(include=["**/*.md"]).allows("any/dir", is_dir=True)
+
+@pytest.mark.parametrize("filename, category", [
+    ("setup.py", "main"),
+    ("package.json", "main"),
+    ("app.py", "source"),
+    ("Dockerfile", "config"),
+    (".gitignore", "config"),
+    (".bashrc", None),
+    ("notes.txt", None),
+])
+def test_classify(filename, category):
+    assert PathFilter.classify(filename) == category
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Tiempo máximo de importación de app.main, con margen para máquinas lentas de CI
+IMPORT_BUDGET_SECONDS = 2.0
+
+# Módulos pesados que solo deben cargarse al crear los clientes, no al importar la app
+LAZY_MODULES = ("openai",)
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+def _import_app() -> dict:
+    """
+    Importa app.main en un intérprete nuevo para medir el arranque en frío,
+    sin módulos ya cargados por pytest.
+    """
+    env = {**os.environ, "PYTHONPATH": str(BACKEND_DIR)}
+    env.setdefault("OPENAI_API_KEY", "test")
+    env.setdefault("GITHUB_TOKEN", "test")
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_import_does_not_load_lazy_clients():
+    modules = set(_import_app()["modules"])
+    for module in LAZY_MODULES:
+        assert module not in modules, f"importar app.main carga {module}"
+
+def test_import_stays_within_budget():
+    elapsed = min(_import_app()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"importar app.main tarda {elapsed:.2f}s"